@@ -13,7 +13,8 @@ def main():
     coin = p3g.Body.from_obj("assets/coin.obj", "coin")
     scene.add_body(coin)
     camera = p3g.Camera(p3g.Vec3(-3, 0, 1), p3g.Vec3(1, 0, -0.3))
-    renderer = p3g.Renderer(screen, camera, scene, clock)
+    renderer = p3g.Renderer(screen, camera, scene, clock,
+                            options=p3g.RenderOptions(dirty_rects=True))
     run = True
 
     while run:
@@ -1,9 +1,407 @@
+#include <math.h>
+#include <limits.h>
 #include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
 #include <Python.h>
 
+#if defined(__SSE2__)
+#include <emmintrin.h>
+#endif
+
+#ifdef _WIN32
+#include <windows.h>
+typedef HANDLE thread_t;
+#define fetch_add(PTR) (InterlockedIncrement(PTR) - 1)
+#else
+#include <pthread.h>
+typedef pthread_t thread_t;
+#define fetch_add(PTR) __atomic_fetch_add(PTR, 1, __ATOMIC_RELAXED)
+#endif
+
 #define min(X, Y) (((X) < (Y)) ? (X) : (Y))
 #define max(X, Y) (((X) > (Y)) ? (X) : (Y))
 
+/* side in pixels of the square tiles shaded by the worker threads */
+#define TILE_SIZE 64
+/* below this number of faces per thread the batch is drawn by a single thread */
+#define MIN_FACES_PER_THREAD 128
+#define MAX_THREADS 64
+/* side in pixels of the tiles of the coarse depth buffer, divides TILE_SIZE */
+#define HIZ_TILE 8
+#define MAX_HIZ_COLUMNS 1024
+/* pixels around the drawn region where the vertices can be without clipping the triangle */
+#define GUARD_BAND 2048
+/* a triangle clipped by the four sides of the guard band has at most seven vertices */
+#define MAX_CLIP_VERTICES 8
+/* the vertices are snapped to 1 / SUBPIXEL of pixel */
+#define SUBPIXEL_BITS 4
+#define SUBPIXEL (1 << SUBPIXEL_BITS)
+#define SUBPIXEL_HALF (SUBPIXEL / 2)
+
+static inline int64_t floor_div(int64_t a, int64_t b) {
+    const int64_t q = a / b;
+
+    return (a % b != 0 && a < 0) ? q - 1 : q;
+}
+
+static inline int64_t to_fixed(float v) {
+    return (int64_t) floor(v * (double) SUBPIXEL + 0.5);
+}
+
+/*
+ * An edge from a to b with the inside of the triangle on its positive side is
+ * a left edge if it goes up and a top edge if it is horizontal and goes right.
+ */
+static inline int64_t is_top_left(int64_t dx, int64_t dy) {
+    return dy < 0 || (dy == 0 && dx > 0);
+}
+
+/*
+ * Narrow the span [*lo, *hi) of a scanline to the steps k where the edge
+ * function s0 + a * k is positive.
+ */
+static inline void clip_span(int64_t s0, int64_t a, int64_t* lo, int64_t* hi) {
+    if (a > 0)
+    {
+        *lo = max(*lo, floor_div(- s0, a) + 1);
+    }
+    else if (a < 0)
+    {
+        *hi = min(*hi, - floor_div(- s0, - a));
+    }
+    else if (s0 <= 0)
+    {
+        *hi = *lo;
+    }
+}
+
+/*
+ * Shade the pixels [x_start, x_end) of a scanline, the depth is z0 at x_ref
+ * and increases by dz for each pixel, so a pixel gets the same depth however
+ * the scanline is split in spans.
+ * Returns 1 if at least one pixel passed the depth test.
+ */
+static inline int shade_span(uint8_t* buffer_row, int bs_x, int bs_c,
+                              float* depth_row, int ds_x,
+                              int x_start, int x_end, int x_ref, float z0, float dz,
+                              uint8_t R, uint8_t G, uint8_t B) {
+    int x = x_start;
+    int written = 0;
+    float depth;
+
+#if defined(__SSE2__)
+    if (ds_x == sizeof(float))
+    {
+        __m128 k = _mm_add_ps(_mm_set1_ps((float) (x - x_ref)),
+                              _mm_setr_ps(0.0f, 1.0f, 2.0f, 3.0f));
+        const __m128 four = _mm_set1_ps(4.0f);
+        const __m128 start = _mm_set1_ps(z0);
+        const __m128 step = _mm_set1_ps(dz);
+
+        for (; x + 4 <= x_end; x += 4)
+        {
+            const __m128 depths = _mm_add_ps(start, _mm_mul_ps(k, step));
+            const __m128 old = _mm_loadu_ps(depth_row + x);
+            const __m128 closer = _mm_cmplt_ps(depths, old);
+            const int mask = _mm_movemask_ps(closer);
+
+            if (mask != 0)
+            {
+                written = 1;
+                _mm_storeu_ps(depth_row + x, _mm_or_ps(_mm_and_ps(closer, depths),
+                                                       _mm_andnot_ps(closer, old)));
+
+                for (int i = 0; i < 4; i++)
+                {
+                    if (mask & (1 << i))
+                    {
+                        uint8_t* pixel = buffer_row + (x + i) * bs_x;
+                        pixel[0] = R;
+                        pixel[bs_c] = G;
+                        pixel[bs_c + bs_c] = B;
+                    }
+                }
+            }
+
+            k = _mm_add_ps(k, four);
+        }
+    }
+#endif
+
+    for (; x < x_end; x++)
+    {
+        depth = z0 + (float) (x - x_ref) * dz;
+        float* old = (float*) ((uint8_t*) depth_row + x * ds_x);
+
+        if (depth < *old)
+        {
+            uint8_t* pixel = buffer_row + x * bs_x;
+            pixel[0] = R;
+            pixel[bs_c] = G;
+            pixel[bs_c + bs_c] = B;
+            *old = depth;
+            written = 1;
+        }
+    }
+
+    return written;
+}
+
+/*
+ * Coarse depth buffer storing for each tile of HIZ_TILE x HIZ_TILE pixels an
+ * upper bound of the depth of its pixels, tiles are stored row by row.
+ * A NaN tile has been cleared without writing its pixels, their depth is
+ * the clear value and it is written when a triangle first reaches the tile.
+ */
+typedef struct {
+    float* tiles;
+    int columns;
+    int w, h;
+    float clear;
+} hiz_t;
+
+/* write the clear value in the pixels of a tile cleared lazily */
+static void resolve_hiz_tile(const hiz_t* hiz, float* depth_buffer,
+                             int ds_x, int ds_y, int tx, int ty) {
+    float* tile = hiz->tiles + ty * hiz->columns + tx;
+
+    if (!isnan(*tile)) return;
+
+    const int x_end = min((tx + 1) * HIZ_TILE, hiz->w);
+    const int y_end = min((ty + 1) * HIZ_TILE, hiz->h);
+
+    for (int y = ty * HIZ_TILE; y < y_end; y++)
+    {
+        uint8_t* depth_row = (uint8_t*) depth_buffer + y * ds_y;
+
+        for (int x = tx * HIZ_TILE; x < x_end; x++)
+        {
+            *(float*) (depth_row + x * ds_x) = hiz->clear;
+        }
+    }
+
+    *tile = hiz->clear;
+}
+
+static void update_hiz_tile(const hiz_t* hiz, const float* depth_buffer,
+                            int ds_x, int ds_y, int tx, int ty) {
+    const int x_end = min((tx + 1) * HIZ_TILE, hiz->w);
+    const int y_end = min((ty + 1) * HIZ_TILE, hiz->h);
+    float tile_max = 0;
+
+    for (int y = ty * HIZ_TILE; y < y_end; y++)
+    {
+        const uint8_t* depth_row = (const uint8_t*) depth_buffer + y * ds_y;
+
+        for (int x = tx * HIZ_TILE; x < x_end; x++)
+        {
+            tile_max = max(tile_max, *(const float*) (depth_row + x * ds_x));
+        }
+    }
+
+    hiz->tiles[ty * hiz->columns + tx] = tile_max;
+}
+
+/*
+ * Rasterize a triangle whose vertices are inside the guard band, so that the
+ * fixed point coordinates and the 64 bit edge functions cannot overflow.
+ * The pixels are sampled at their centers and a sample on an edge belongs to
+ * the triangle only if the edge is a top or a left edge, so the pixels on the
+ * edge shared by two triangles are drawn exactly once.
+ */
+static void rasterize_triangle(uint8_t* buffer,
+                               int bs_x, int bs_y, int bs_c,
+                               float* depth_buffer,
+                               int ds_x, int ds_y,
+                               float p1xf, float p1yf, float p1z,
+                               float p2xf, float p2yf, float p2z,
+                               float p3xf, float p3yf, float p3z,
+                               uint8_t R, uint8_t G, uint8_t B,
+                               int x0, int y0, int x1, int y1,
+                               const hiz_t* hiz) {
+
+    const int64_t p1x = to_fixed(p1xf);
+    const int64_t p1y = to_fixed(p1yf);
+    int64_t p2x = to_fixed(p2xf);
+    int64_t p2y = to_fixed(p2yf);
+    int64_t p3x = to_fixed(p3xf);
+    int64_t p3y = to_fixed(p3yf);
+
+    int64_t area = (p2x - p1x) * (p3y - p1y) - (p2y - p1y) * (p3x - p1x);
+
+    if (area == 0) return;
+
+    if (area < 0)
+    {
+        // swap the last two vertices so the inside is where the edge functions are positive
+        int64_t t = p2x; p2x = p3x; p3x = t;
+        t = p2y; p2y = p3y; p3y = t;
+        const float tz = p2z; p2z = p3z; p3z = tz;
+        area = - area;
+    }
+
+    // pixels whose center is inside the bounding box of the triangle
+    const int min_x = (int) max(floor_div(min(min(p1x, p2x), p3x) - SUBPIXEL_HALF + SUBPIXEL - 1,
+                                          SUBPIXEL), x0);
+    const int max_x = (int) min(floor_div(max(max(p1x, p2x), p3x) - SUBPIXEL_HALF, SUBPIXEL),
+                                x1 - 1);
+    const int min_y = (int) max(floor_div(min(min(p1y, p2y), p3y) - SUBPIXEL_HALF + SUBPIXEL - 1,
+                                          SUBPIXEL), y0);
+    const int max_y = (int) min(floor_div(max(max(p1y, p2y), p3y) - SUBPIXEL_HALF, SUBPIXEL),
+                                y1 - 1);
+
+    if (min_x > max_x || min_y > max_y) return;
+
+    // edge from a to b: (b.x - a.x) * (y - a.y) - (b.y - a.y) * (x - a.x)
+    const int64_t dx1 = p2x - p1x, dy1 = p2y - p1y;
+    const int64_t dx2 = p3x - p2x, dy2 = p3y - p2y;
+    const int64_t dx3 = p1x - p3x, dy3 = p1y - p3y;
+
+    // edge functions at the center of (min_x, min_y), a sample on a top or left
+    // edge is inside, so the top left edges are biased by one
+    const int64_t sx = (int64_t) min_x * SUBPIXEL + SUBPIXEL_HALF;
+    const int64_t sy = (int64_t) min_y * SUBPIXEL + SUBPIXEL_HALF;
+    int64_t s1 = dx1 * (sy - p1y) - dy1 * (sx - p1x) + is_top_left(dx1, dy1);
+    int64_t s2 = dx2 * (sy - p2y) - dy2 * (sx - p2x) + is_top_left(dx2, dy2);
+    int64_t s3 = dx3 * (sy - p3y) - dy3 * (sx - p3x) + is_top_left(dx3, dy3);
+
+    // the depth is interpolated on the plane of the triangle starting from the pixel
+    // of the first vertex, it grows by dz for each pixel and by dz_row for each scanline
+    const double scale = (double) SUBPIXEL / area;
+    const double dz_pixel = - ((p2z - p1z) * dy3 + (p3z - p1z) * dy1) * scale;
+    const double dz_row = ((p2z - p1z) * dx3 + (p3z - p1z) * dx1) * scale;
+    const float dz = (float) dz_pixel;
+    const int x_ref = (int) floor_div(p1x, SUBPIXEL);
+    const double z_ref = p1z + dz_pixel * (x_ref * SUBPIXEL + SUBPIXEL_HALF - p1x) / SUBPIXEL;
+
+    const float min_z = min(min(p1z, p2z), p3z);
+    const int tx0 = min_x / HIZ_TILE;
+    const int tx1 = max_x / HIZ_TILE;
+    uint8_t visible[MAX_HIZ_COLUMNS];
+    uint8_t dirty[MAX_HIZ_COLUMNS];
+
+    if (hiz != NULL)
+    {
+        for (int ty = min_y / HIZ_TILE; ty <= max_y / HIZ_TILE; ty++)
+            for (int tx = tx0; tx <= tx1; tx++)
+                resolve_hiz_tile(hiz, depth_buffer, ds_x, ds_y, tx, ty);
+    }
+
+    if (hiz != NULL && tx1 - tx0 >= MAX_HIZ_COLUMNS) hiz = NULL;
+
+    if (hiz != NULL)
+    {
+        // reject the whole triangle if it is behind every tile it covers
+        int occluded = 1;
+
+        for (int ty = min_y / HIZ_TILE; ty <= max_y / HIZ_TILE && occluded; ty++)
+            for (int tx = tx0; tx <= tx1 && occluded; tx++)
+                occluded = min_z > hiz->tiles[ty * hiz->columns + tx];
+
+        if (occluded) return;
+    }
+
+    for (int y = min_y; y <= max_y; y++)
+    {
+        const int ty = y / HIZ_TILE;
+
+        if (hiz != NULL && (y == min_y || y % HIZ_TILE == 0))
+        {
+            for (int tx = tx0; tx <= tx1; tx++)
+            {
+                visible[tx - tx0] = min_z <= hiz->tiles[ty * hiz->columns + tx];
+                dirty[tx - tx0] = 0;
+            }
+        }
+
+        int64_t lo = 0;
+        int64_t hi = max_x - min_x + 1;
+
+        clip_span(s1, - dy1 * SUBPIXEL, &lo, &hi);
+        clip_span(s2, - dy2 * SUBPIXEL, &lo, &hi);
+        clip_span(s3, - dy3 * SUBPIXEL, &lo, &hi);
+
+        uint8_t* buffer_row = buffer + y * bs_y;
+        float* depth_row = (float*) ((uint8_t*) depth_buffer + y * ds_y);
+        // depth at the center of (x_ref, y)
+        const float z_row = (float) (z_ref + (y * SUBPIXEL + SUBPIXEL_HALF - p1y) *
+                                     (dz_row / SUBPIXEL));
+
+        if (lo < hi && hiz == NULL)
+        {
+            shade_span(buffer_row, bs_x, bs_c, depth_row, ds_x,
+                       min_x + (int) lo, min_x + (int) hi, x_ref, z_row, dz, R, G, B);
+        }
+        else if (lo < hi)
+        {
+            // shade the span one tile at a time, skipping the occluded tiles
+            for (int start = min_x + (int) lo; start < min_x + (int) hi;)
+            {
+                const int tx = start / HIZ_TILE;
+                const int end = min((tx + 1) * HIZ_TILE, min_x + (int) hi);
+
+                if (visible[tx - tx0])
+                {
+                    dirty[tx - tx0] |= shade_span(buffer_row, bs_x, bs_c, depth_row, ds_x,
+                                                  start, end, x_ref, z_row, dz, R, G, B);
+                }
+
+                start = end;
+            }
+        }
+
+        if (hiz != NULL && (y == max_y || y % HIZ_TILE == HIZ_TILE - 1))
+        {
+            for (int tx = tx0; tx <= tx1; tx++)
+            {
+                if (dirty[tx - tx0])
+                    update_hiz_tile(hiz, depth_buffer, ds_x, ds_y, tx, ty);
+            }
+        }
+
+        s1 += dx1 * SUBPIXEL;
+        s2 += dx2 * SUBPIXEL;
+        s3 += dx3 * SUBPIXEL;
+    }
+}
+
+typedef struct {
+    double x, y, z;
+} vertex_t;
+
+/*
+ * Clip a convex polygon against the half plane where sign * (coordinate - bound)
+ * is not negative, the coordinate is x for axis 0 and y for axis 1.
+ * Returns the number of vertices written in out.
+ */
+static int clip_polygon(const vertex_t* in, int n, vertex_t* out,
+                        int axis, double bound, double sign) {
+    int count = 0;
+
+    for (int i = 0; i < n; i++)
+    {
+        const vertex_t* a = in + i;
+        const vertex_t* b = in + (i + 1) % n;
+        const double da = sign * ((axis ? a->y : a->x) - bound);
+        const double db = sign * ((axis ? b->y : b->x) - bound);
+
+        if (da >= 0) out[count++] = *a;
+
+        if ((da >= 0) != (db >= 0))
+        {
+            const double t = da / (da - db);
+
+            out[count].x = a->x + t * (b->x - a->x);
+            out[count].y = a->y + t * (b->y - a->y);
+            out[count].z = a->z + t * (b->z - a->z);
+            count++;
+        }
+    }
+
+    return count;
+}
+
 static void draw_triangle(uint8_t* buffer,
                           int bs_x, int bs_y, int bs_c,
                           float* depth_buffer,
@@ -12,78 +410,310 @@ static void draw_triangle(uint8_t* buffer,
                           float p2xf, float p2yf, float p2z,
                           float p3xf, float p3yf, float p3z,
                           uint8_t R, uint8_t G, uint8_t B,
-                          int w, int h) {
-
-    const int p1x = (int) p1xf;
-    const int p2x = (int) p2xf;
-    const int p3x = (int) p3xf;
-    const int p1y = (int) p1yf;
-    const int p2y = (int) p2yf;
-    const int p3y = (int) p3yf;
-
-    const int min_x = max(min(min(p1x, p2x), p3x), 0);
-    const int max_x = min(max(max(p1x, p2x), p3x), w - 1);
-    const int min_y = max(min(min(p1y, p2y), p3y), 0);
-    const int max_y = min(max(max(p1y, p2y), p3y), h - 1);
-
-    if (min_x > max_x + 1 || min_y > max_y + 1) return;
-
-    const int p1_p2_x_diff = p1x - p2x;
-    const int p2_p3_x_diff = p2x - p3x;
-    const int p3_p1_x_diff = p3x - p1x;
-    const int p1_p2_y_diff = p1y - p2y;
-    const int p2_p3_y_diff = p2y - p3y;
-    const int p3_p1_y_diff = p3y - p1y;
-    const int p2_p1_cross = p1_p2_x_diff * p2y - p1_p2_y_diff * p2x;
-    const int p3_p2_cross = p2_p3_x_diff * p3y - p2_p3_y_diff * p3x;
-    const int p1_p3_cross = p3_p1_x_diff * p1y - p3_p1_y_diff * p1x;
-
-    int area = p3_p1_y_diff * p2_p3_x_diff - p3_p1_x_diff * p2_p3_y_diff;
+                          int x0, int y0, int x1, int y1,
+                          const hiz_t* hiz) {
 
-    if (area == 0) return;
+    // infinite or not a number coordinates make the sum not finite
+    if (!isfinite(p1xf + p1yf + p1z + p2xf + p2yf + p2z + p3xf + p3yf + p3z)) return;
 
-    const float inv_area = 1.0f / area;
+    const float min_xf = min(min(p1xf, p2xf), p3xf);
+    const float max_xf = max(max(p1xf, p2xf), p3xf);
+    const float min_yf = min(min(p1yf, p2yf), p3yf);
+    const float max_yf = max(max(p1yf, p2yf), p3yf);
 
-    float depth;
-    int offset;
-    int depth_offest;
-    int s1;
-    int s2;
-    int s3;
+    // reject the triangles out of the region before any conversion to integers
+    if (max_xf < x0 - 1 || min_xf >= x1 || max_yf < y0 - 1 || min_yf >= y1) return;
 
-    for (int y = min_y; y <= max_y; y++)
+    const int gx0 = x0 - GUARD_BAND;
+    const int gx1 = x1 + GUARD_BAND;
+    const int gy0 = y0 - GUARD_BAND;
+    const int gy1 = y1 + GUARD_BAND;
+
+    if (min_xf >= gx0 && max_xf <= gx1 && min_yf >= gy0 && max_yf <= gy1)
     {
-        for (int x = min_x; x <= max_x; x++)
-        {
-            s1 = p1_p2_y_diff * x - p1_p2_x_diff * y + p2_p1_cross;
-            s2 = p2_p3_y_diff * x - p2_p3_x_diff * y + p3_p2_cross;
-            s3 = p3_p1_y_diff * x - p3_p1_x_diff * y + p1_p3_cross;
+        rasterize_triangle(buffer, bs_x, bs_y, bs_c, depth_buffer, ds_x, ds_y,
+                           p1xf, p1yf, p1z, p2xf, p2yf, p2z, p3xf, p3yf, p3z,
+                           R, G, B, x0, y0, x1, y1, hiz);
+        return;
+    }
 
-            if (((s1 > 0) && (s2 > 0) && (s3 > 0)) || ((s1 <= 0) && (s2 <= 0) && (s3 <= 0)))
-            {
-                depth = (p1z * s2 + p2z * s3 + p3z * s1) * inv_area;
-                depth_offest = (x * ds_x + y * ds_y) / sizeof(float);
+    // clip the triangle to the guard band and draw the resulting polygon as a fan
+    vertex_t polygon[MAX_CLIP_VERTICES] = {{p1xf, p1yf, p1z}, {p2xf, p2yf, p2z}, {p3xf, p3yf, p3z}};
+    vertex_t clipped[MAX_CLIP_VERTICES];
+    int n = 3;
 
-                if (depth < depth_buffer[depth_offest])
-                {
-                    offset = x * bs_x + y * bs_y;
-                    buffer[offset] = R;
-                    buffer[offset + bs_c] = G;
-                    buffer[offset + bs_c + bs_c] = B;
-                    depth_buffer[depth_offest] = depth;
-                }
-            }
+    n = clip_polygon(polygon, n, clipped, 0, gx0, 1);
+    n = clip_polygon(clipped, n, polygon, 0, gx1, - 1);
+    n = clip_polygon(polygon, n, clipped, 1, gy0, 1);
+    n = clip_polygon(clipped, n, polygon, 1, gy1, - 1);
+
+    for (int i = 1; i + 1 < n; i++)
+    {
+        rasterize_triangle(buffer, bs_x, bs_y, bs_c, depth_buffer, ds_x, ds_y,
+                           (float) polygon[0].x, (float) polygon[0].y, (float) polygon[0].z,
+                           (float) polygon[i].x, (float) polygon[i].y, (float) polygon[i].z,
+                           (float) polygon[i + 1].x, (float) polygon[i + 1].y,
+                           (float) polygon[i + 1].z,
+                           R, G, B, x0, y0, x1, y1, hiz);
+    }
+}
+
+typedef struct {
+    uint8_t* buffer;
+    int bs_x, bs_y, bs_c;
+    float* depth_buffer;
+    int ds_x, ds_y;
+    const float* points;
+    int n_points;
+    const int32_t* faces;
+    const uint8_t* colors;
+    int n_faces;
+    int w, h;
+    // scissor rectangle, only the pixels with x0 <= x < x1 and y0 <= y < y1 are drawn
+    int x0, y0, x1, y1;
+    const hiz_t* hiz;
+} batch_t;
+
+typedef struct {
+    const batch_t* batch;
+    int tiles_x;
+    int n_tiles;
+    const int* bin_start;
+    const int* bin_faces;
+    long next_tile;
+} tiled_job_t;
+
+/* truncate a finite coordinate clamped to [lo, hi], so the conversion cannot overflow */
+static inline int clamp_coord(float v, int lo, int hi) {
+    return v <= lo ? lo : (v >= hi ? hi : (int) v);
+}
+
+static int face_bounds(const batch_t* batch, int i,
+                       int* min_x, int* min_y, int* max_x, int* max_y) {
+    const int32_t* face = batch->faces + 3 * i;
+
+    if (face[0] < 0 || face[0] >= batch->n_points ||
+        face[1] < 0 || face[1] >= batch->n_points ||
+        face[2] < 0 || face[2] >= batch->n_points) return 0;
+
+    const float* p1 = batch->points + 3 * face[0];
+    const float* p2 = batch->points + 3 * face[1];
+    const float* p3 = batch->points + 3 * face[2];
+
+    if (!isfinite(p1[0] + p1[1] + p2[0] + p2[1] + p3[0] + p3[1])) return 0;
+
+    *min_x = clamp_coord(min(min(p1[0], p2[0]), p3[0]), batch->x0, batch->x1);
+    *max_x = clamp_coord(max(max(p1[0], p2[0]), p3[0]), batch->x0 - 1, batch->x1 - 1);
+    *min_y = clamp_coord(min(min(p1[1], p2[1]), p3[1]), batch->y0, batch->y1);
+    *max_y = clamp_coord(max(max(p1[1], p2[1]), p3[1]), batch->y0 - 1, batch->y1 - 1);
+
+    return *min_x <= *max_x && *min_y <= *max_y;
+}
+
+static void draw_face(const batch_t* batch, int i, int x0, int y0, int x1, int y1) {
+    const int32_t* face = batch->faces + 3 * i;
+    const uint8_t* color = batch->colors + 3 * i;
+
+    if (face[0] < 0 || face[0] >= batch->n_points ||
+        face[1] < 0 || face[1] >= batch->n_points ||
+        face[2] < 0 || face[2] >= batch->n_points) return;
+
+    const float* p1 = batch->points + 3 * face[0];
+    const float* p2 = batch->points + 3 * face[1];
+    const float* p3 = batch->points + 3 * face[2];
+
+    draw_triangle(batch->buffer, batch->bs_x, batch->bs_y, batch->bs_c,
+                  batch->depth_buffer, batch->ds_x, batch->ds_y,
+                  p1[0], p1[1], p1[2],
+                  p2[0], p2[1], p2[2],
+                  p3[0], p3[1], p3[2],
+                  color[0], color[1], color[2], x0, y0, x1, y1, batch->hiz);
+}
+
+static void draw_tiles(tiled_job_t* job) {
+    const batch_t* batch = job->batch;
+
+    for (;;)
+    {
+        const long tile = fetch_add(&job->next_tile);
+
+        if (tile >= job->n_tiles) return;
+
+        const int tile_x = (tile % job->tiles_x) * TILE_SIZE;
+        const int tile_y = (tile / job->tiles_x) * TILE_SIZE;
+        const int x0 = max(tile_x, batch->x0);
+        const int y0 = max(tile_y, batch->y0);
+        const int x1 = min(tile_x + TILE_SIZE, batch->x1);
+        const int y1 = min(tile_y + TILE_SIZE, batch->y1);
+
+        for (int k = job->bin_start[tile]; k < job->bin_start[tile + 1]; k++)
+        {
+            draw_face(batch, job->bin_faces[k], x0, y0, x1, y1);
         }
     }
 }
 
-static void fill_bg(uint8_t* buffer,
-                    int bs_x, int bs_y, int bs_c,
-                    uint8_t R, uint8_t G, uint8_t B,
-                    int w, int h) {
-    for (int y = 0; y < h; y++)
+#ifdef _WIN32
+static DWORD WINAPI tile_worker(LPVOID arg) {
+    draw_tiles((tiled_job_t*) arg);
+    return 0;
+}
+#else
+static void* tile_worker(void* arg) {
+    draw_tiles((tiled_job_t*) arg);
+    return NULL;
+}
+#endif
+
+/*
+ * Bin the faces in screen tiles and shade the tiles in parallel,
+ * the faces of each tile are drawn in the order of the batch so the
+ * result is the same as drawing them with a single thread.
+ * Returns 0 if the memory for the bins cannot be allocated.
+ */
+static int draw_triangles_tiled(const batch_t* batch, int threads) {
+    const int tiles_x = (batch->w + TILE_SIZE - 1) / TILE_SIZE;
+    const int tiles_y = (batch->h + TILE_SIZE - 1) / TILE_SIZE;
+    const int n_tiles = tiles_x * tiles_y;
+    int min_x, min_y, max_x, max_y;
+
+    int* bin_start = calloc(n_tiles + 1, sizeof(int));
+    if (bin_start == NULL) return 0;
+
+    for (int i = 0; i < batch->n_faces; i++)
+    {
+        if (!face_bounds(batch, i, &min_x, &min_y, &max_x, &max_y)) continue;
+
+        for (int ty = min_y / TILE_SIZE; ty <= max_y / TILE_SIZE; ty++)
+            for (int tx = min_x / TILE_SIZE; tx <= max_x / TILE_SIZE; tx++)
+                bin_start[ty * tiles_x + tx + 1]++;
+    }
+
+    for (int t = 0; t < n_tiles; t++) bin_start[t + 1] += bin_start[t];
+
+    int* bin_faces = malloc(max(bin_start[n_tiles], 1) * sizeof(int));
+    int* bin_fill = malloc(n_tiles * sizeof(int));
+
+    if (bin_faces == NULL || bin_fill == NULL)
+    {
+        free(bin_start);
+        free(bin_faces);
+        free(bin_fill);
+        return 0;
+    }
+
+    memcpy(bin_fill, bin_start, n_tiles * sizeof(int));
+
+    for (int i = 0; i < batch->n_faces; i++)
     {
-        for (int x = 0; x < w; x++)
+        if (!face_bounds(batch, i, &min_x, &min_y, &max_x, &max_y)) continue;
+
+        for (int ty = min_y / TILE_SIZE; ty <= max_y / TILE_SIZE; ty++)
+            for (int tx = min_x / TILE_SIZE; tx <= max_x / TILE_SIZE; tx++)
+                bin_faces[bin_fill[ty * tiles_x + tx]++] = i;
+    }
+
+    tiled_job_t job = {batch, tiles_x, n_tiles, bin_start, bin_faces, 0};
+    thread_t workers[MAX_THREADS];
+    int started = 0;
+
+    threads = min(threads, n_tiles);
+
+    for (int i = 1; i < threads; i++)
+    {
+#ifdef _WIN32
+        workers[started] = CreateThread(NULL, 0, tile_worker, &job, 0, NULL);
+        if (workers[started] == NULL) break;
+#else
+        if (pthread_create(&workers[started], NULL, tile_worker, &job) != 0) break;
+#endif
+        started++;
+    }
+
+    draw_tiles(&job);
+
+    for (int i = 0; i < started; i++)
+    {
+#ifdef _WIN32
+        WaitForSingleObject(workers[i], INFINITE);
+        CloseHandle(workers[i]);
+#else
+        pthread_join(workers[i], NULL);
+#endif
+    }
+
+    free(bin_start);
+    free(bin_faces);
+    free(bin_fill);
+
+    return 1;
+}
+
+static void draw_triangles(const batch_t* batch, int threads) {
+    threads = min(min(threads, batch->n_faces / MIN_FACES_PER_THREAD), MAX_THREADS);
+
+    if (threads > 1 && draw_triangles_tiled(batch, threads)) return;
+
+    for (int i = 0; i < batch->n_faces; i++)
+    {
+        draw_face(batch, i, batch->x0, batch->y0, batch->x1, batch->y1);
+    }
+}
+
+/*
+ * Repeat the first unit bytes at first until length bytes are filled, doubling the
+ * copied block each time, then copy them in lines - 1 more lines stride bytes apart.
+ */
+static void repeat_lines(uint8_t* first, size_t unit, size_t length, int lines, size_t stride) {
+    size_t filled = min(unit, length);
+
+    while (filled < length)
+    {
+        const size_t count = min(filled, length - filled);
+        memcpy(first + filled, first, count);
+        filled += count;
+    }
+
+    for (int i = 1; i < lines; i++)
+    {
+        memcpy(first + i * stride, first, length);
+    }
+}
+
+/*
+ * Fill the pixels with x0 <= x < x1 and y0 <= y < y1 with a color.
+ * When the pixels along x or y are packed without overlapping the next line,
+ * the first pixel is repeated with memcpy, which also copies the unused byte
+ * of 32 bit pixels, otherwise the channels are written one pixel at a time.
+ */
+static void fill_color(uint8_t* buffer,
+                       int bs_x, int bs_y, int bs_c,
+                       uint8_t R, uint8_t G, uint8_t B,
+                       int x0, int y0, int x1, int y1) {
+    if (x0 >= x1 || y0 >= y1) return;
+
+    uint8_t* start = buffer + x0 * bs_x + y0 * bs_y;
+    const int inner_x = bs_x <= bs_y;
+    const int inner = inner_x ? bs_x : bs_y;
+    const int outer = inner_x ? bs_y : bs_x;
+    const int pixels = inner_x ? x1 - x0 : y1 - y0;
+    const int lines = inner_x ? y1 - y0 : x1 - x0;
+    // bytes from the first to the last channel of a pixel
+    const int span = 2 * abs(bs_c) + 1;
+    const size_t length = (size_t) (pixels - 1) * inner + span;
+
+    if (inner > 0 && span <= inner && length <= (size_t) outer)
+    {
+        start[0] = R;
+        start[bs_c] = G;
+        start[2 * bs_c] = B;
+        repeat_lines(start + min(0, 2 * bs_c), inner, length, lines, outer);
+        return;
+    }
+
+    for (int y = y0; y < y1; y++)
+    {
+        for (int x = x0; x < x1; x++)
         {
             int offset = x * bs_x + y * bs_y;
             buffer[offset] = R;
@@ -93,15 +723,115 @@ static void fill_bg(uint8_t* buffer,
     }
 }
 
+/* fill the pixels with x0 <= x < x1 and y0 <= y < y1 with a depth */
+static void fill_depth(float* depth_buffer, int ds_x, int ds_y, float z,
+                       int x0, int y0, int x1, int y1) {
+    if (x0 >= x1 || y0 >= y1) return;
+
+    uint8_t* start = (uint8_t*) depth_buffer + x0 * ds_x + y0 * ds_y;
+
+    if (ds_x == sizeof(float) && ds_y >= (x1 - x0) * ds_x)
+    {
+        *(float*) start = z;
+        repeat_lines(start, sizeof(float), (size_t) (x1 - x0) * ds_x, y1 - y0, ds_y);
+        return;
+    }
+
+    if (ds_y == sizeof(float) && ds_x >= (y1 - y0) * ds_y)
+    {
+        *(float*) start = z;
+        repeat_lines(start, sizeof(float), (size_t) (y1 - y0) * ds_y, x1 - x0, ds_x);
+        return;
+    }
+
+    for (int y = y0; y < y1; y++)
+    {
+        for (int x = x0; x < x1; x++)
+        {
+            *(float*) (start + (x - x0) * ds_x + (y - y0) * ds_y) = z;
+        }
+    }
+}
+
+/*
+ * Clear the color and the depth of the pixels with x0 <= x < x1 and y0 <= y < y1.
+ * With a coarse depth buffer the tiles entirely inside the rectangle are only
+ * marked as cleared, their depth is written when a triangle first reaches them,
+ * the tiles partially inside are resolved and their pixels inside are cleared.
+ */
+static void clear(uint8_t* buffer, int bs_x, int bs_y, int bs_c,
+                  uint8_t R, uint8_t G, uint8_t B,
+                  float* depth_buffer, int ds_x, int ds_y, float z,
+                  const hiz_t* hiz, int x0, int y0, int x1, int y1) {
+    if (x0 >= x1 || y0 >= y1) return;
+
+    fill_color(buffer, bs_x, bs_y, bs_c, R, G, B, x0, y0, x1, y1);
+
+    if (hiz == NULL)
+    {
+        fill_depth(depth_buffer, ds_x, ds_y, z, x0, y0, x1, y1);
+        return;
+    }
+
+    for (int ty = y0 / HIZ_TILE; ty <= (y1 - 1) / HIZ_TILE; ty++)
+    {
+        for (int tx = x0 / HIZ_TILE; tx <= (x1 - 1) / HIZ_TILE; tx++)
+        {
+            const int tile_x0 = tx * HIZ_TILE, tile_y0 = ty * HIZ_TILE;
+            const int tile_x1 = min(tile_x0 + HIZ_TILE, hiz->w);
+            const int tile_y1 = min(tile_y0 + HIZ_TILE, hiz->h);
+
+            if (tile_x0 >= x0 && tile_y0 >= y0 && tile_x1 <= x1 && tile_y1 <= y1)
+            {
+                hiz->tiles[ty * hiz->columns + tx] = NAN;
+                continue;
+            }
+
+            resolve_hiz_tile(hiz, depth_buffer, ds_x, ds_y, tx, ty);
+            fill_depth(depth_buffer, ds_x, ds_y, z,
+                       max(x0, tile_x0), max(y0, tile_y0), min(x1, tile_x1), min(y1, tile_y1));
+            hiz->tiles[ty * hiz->columns + tx] = z;
+        }
+    }
+}
+
+/* write the clear value in the pixels of all the tiles cleared lazily */
+static void resolve_depth(float* depth_buffer, int ds_x, int ds_y, const hiz_t* hiz) {
+    const int rows = (hiz->h + HIZ_TILE - 1) / HIZ_TILE;
+
+    for (int ty = 0; ty < rows; ty++)
+        for (int tx = 0; tx < hiz->columns; tx++)
+            resolve_hiz_tile(hiz, depth_buffer, ds_x, ds_y, tx, ty);
+}
+
 PyDoc_STRVAR(ext_rendering__doc__,
 "Low level drawing on the pygame buffer.");
 
 PyDoc_STRVAR(draw_triangle__doc__,
 "Draw a triangle on the pygame buffer.");
 
+PyDoc_STRVAR(draw_triangles__doc__,
+"Draw a batch of triangles on the pygame buffer, the triangles are given as\n"
+"contiguous arrays of float32 points (N, 3), int32 faces (K, 3) and uint8 colors (K, 3).\n"
+"The optional arguments are the number of threads shading the screen tiles, the\n"
+"pointer to a float32 coarse depth buffer with one value for each HIZ_TILE x HIZ_TILE\n"
+"pixels, stored row by row, used to skip the occluded triangles and tiles, and the\n"
+"scissor rectangle x0, y0, x1, y1 outside which nothing is drawn and the depth\n"
+"written in the pixels of the coarse depth tiles cleared lazily by clear.");
+
 PyDoc_STRVAR(fill_bg__doc__,
 "Fill the background with its color.");
 
+PyDoc_STRVAR(clear__doc__,
+"Clear the color and the float32 depth of the pixels of the pygame buffer.\n"
+"The optional arguments are the pointer to the coarse depth buffer and the\n"
+"rectangle x0, y0, x1, y1 to clear, the whole buffer by default. With the coarse\n"
+"depth buffer the tiles inside the rectangle are set to NaN and their depth is\n"
+"written by draw_triangles only when a triangle reaches them, see resolve_depth.");
+
+PyDoc_STRVAR(resolve_depth__doc__,
+"Write the depth of all the pixels of the coarse depth tiles cleared lazily.");
+
 static PyObject* py_draw_triangle(PyObject* self, PyObject* args)
 {
     unsigned long long buffer_ptr;
@@ -131,11 +861,61 @@ static PyObject* py_draw_triangle(PyObject* self, PyObject* args)
                   p1xf, p1yf, p1z,
                   p2xf, p2yf, p2z,
                   p3xf, p3yf, p3z,
-                  R, G, B, w, h);
+                  R, G, B, 0, 0, w, h, NULL);
 
 	Py_RETURN_NONE;
 }
 
+static PyObject* py_draw_triangles(PyObject* self, PyObject* args)
+{
+    unsigned long long buffer_ptr;
+    unsigned long long depth_buffer_ptr;
+    unsigned long long points_ptr;
+    unsigned long long faces_ptr;
+    unsigned long long colors_ptr;
+    unsigned long long hiz_ptr = 0;
+    int threads = 1;
+    int x0 = 0, y0 = 0, x1 = INT_MAX, y1 = INT_MAX;
+    float clear_z = INFINITY;
+    batch_t batch;
+    hiz_t hiz;
+
+    if (!PyArg_ParseTuple(args, "KiiiKiiKiKKiii|iKiiiif:draw_triangles",
+                          &buffer_ptr, &batch.bs_x, &batch.bs_y, &batch.bs_c,
+                          &depth_buffer_ptr, &batch.ds_x, &batch.ds_y,
+                          &points_ptr, &batch.n_points,
+                          &faces_ptr, &colors_ptr, &batch.n_faces,
+                          &batch.w, &batch.h, &threads, &hiz_ptr,
+                          &x0, &y0, &x1, &y1, &clear_z))
+        return NULL;
+
+    batch.x0 = max(x0, 0);
+    batch.y0 = max(y0, 0);
+    batch.x1 = min(x1, batch.w);
+    batch.y1 = min(y1, batch.h);
+
+    if (batch.x0 >= batch.x1 || batch.y0 >= batch.y1) Py_RETURN_NONE;
+
+    hiz.tiles = (float*) hiz_ptr;
+    hiz.columns = (batch.w + HIZ_TILE - 1) / HIZ_TILE;
+    hiz.w = batch.w;
+    hiz.h = batch.h;
+    hiz.clear = clear_z;
+    batch.hiz = hiz_ptr ? &hiz : NULL;
+
+    batch.buffer = (uint8_t*) buffer_ptr;
+    batch.depth_buffer = (float*) depth_buffer_ptr;
+    batch.points = (const float*) points_ptr;
+    batch.faces = (const int32_t*) faces_ptr;
+    batch.colors = (const uint8_t*) colors_ptr;
+
+    Py_BEGIN_ALLOW_THREADS
+    draw_triangles(&batch, threads);
+    Py_END_ALLOW_THREADS
+
+    Py_RETURN_NONE;
+}
+
 static PyObject* py_fill_bg(PyObject* self, PyObject* args)
 {
     unsigned long long buffer_ptr;
@@ -150,15 +930,76 @@ static PyObject* py_fill_bg(PyObject* self, PyObject* args)
 
     uint8_t* buffer = (uint8_t*) buffer_ptr;
 
-	fill_bg(buffer, bs_x, bs_y, bs_c,
-            R, G, B, w, h);
+	fill_color(buffer, bs_x, bs_y, bs_c,
+               R, G, B, 0, 0, w, h);
 
 	Py_RETURN_NONE;
 }
 
+static PyObject* py_clear(PyObject* self, PyObject* args)
+{
+    unsigned long long buffer_ptr;
+    int bs_x, bs_y, bs_c;
+    uint8_t R, G, B;
+    unsigned long long depth_buffer_ptr;
+    int ds_x, ds_y;
+    float z;
+    int w, h;
+    unsigned long long hiz_ptr = 0;
+    int x0 = 0, y0 = 0, x1 = INT_MAX, y1 = INT_MAX;
+    hiz_t hiz;
+
+    if (!PyArg_ParseTuple(args, "KiiibbbKiifii|Kiiii:clear",
+                          &buffer_ptr, &bs_x, &bs_y, &bs_c, &R, &G, &B,
+                          &depth_buffer_ptr, &ds_x, &ds_y, &z, &w, &h,
+                          &hiz_ptr, &x0, &y0, &x1, &y1))
+        return NULL;
+
+    hiz.tiles = (float*) hiz_ptr;
+    hiz.columns = (w + HIZ_TILE - 1) / HIZ_TILE;
+    hiz.w = w;
+    hiz.h = h;
+    hiz.clear = z;
+
+    Py_BEGIN_ALLOW_THREADS
+    clear((uint8_t*) buffer_ptr, bs_x, bs_y, bs_c, R, G, B,
+          (float*) depth_buffer_ptr, ds_x, ds_y, z, hiz_ptr ? &hiz : NULL,
+          max(x0, 0), max(y0, 0), min(x1, w), min(y1, h));
+    Py_END_ALLOW_THREADS
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* py_resolve_depth(PyObject* self, PyObject* args)
+{
+    unsigned long long depth_buffer_ptr;
+    int ds_x, ds_y;
+    float z;
+    int w, h;
+    unsigned long long hiz_ptr;
+    hiz_t hiz;
+
+    if (!PyArg_ParseTuple(args, "KiifiiK:resolve_depth",
+                          &depth_buffer_ptr, &ds_x, &ds_y, &z, &w, &h, &hiz_ptr))
+        return NULL;
+
+    hiz.tiles = (float*) hiz_ptr;
+    hiz.columns = (w + HIZ_TILE - 1) / HIZ_TILE;
+    hiz.w = w;
+    hiz.h = h;
+    hiz.clear = z;
+
+    resolve_depth((float*) depth_buffer_ptr, ds_x, ds_y, &hiz);
+
+    Py_RETURN_NONE;
+}
+
 static PyMethodDef ext_rendering_methods[] = {
 	{"draw_triangle",  py_draw_triangle, METH_VARARGS, draw_triangle__doc__},
+    {"draw_triangles",  py_draw_triangles, METH_VARARGS, draw_triangles__doc__},
     {"fill_bg",  py_fill_bg, METH_VARARGS, fill_bg__doc__},
+    {"clear",  py_clear, METH_VARARGS, clear__doc__},
+    {"resolve_depth",  py_resolve_depth, METH_VARARGS, resolve_depth__doc__},
 	{NULL, NULL}
 };
 
@@ -173,5 +1014,13 @@ static struct PyModuleDef extRendering =
 
 PyMODINIT_FUNC PyInit_ext_rendering(void)
 {
-    return PyModule_Create(&extRendering);
+    PyObject* module = PyModule_Create(&extRendering);
+
+    if (module != NULL && PyModule_AddIntConstant(module, "HIZ_TILE", HIZ_TILE) < 0)
+    {
+        Py_DECREF(module);
+        return NULL;
+    }
+
+    return module;
 }
\ No newline at end of file
@@ -3,6 +3,9 @@ Easy to use 3d engine based on pygame.
 """
 
 from .color import Color
-from .rendering import Camera, Renderer
-from .scene import Body, Scene
+from .camera import Camera
+from .rendering import Renderer, RenderOptions
+from .body import Body
+from .instance import Instance
+from .scene import Scene
 from .math3d import Vec3, Quat, Mat
@@ -0,0 +1,185 @@
+"""
+Loading of meshes from files.
+"""
+
+import os
+import re
+import zipfile
+import numpy as np
+
+
+# the captured values stop at the end of the line or at a comment
+_VERTEX = re.compile(rb"^v[ \t]+([^#\r\n]*)", re.MULTILINE)
+_FACE = re.compile(rb"^f[ \t]+([^#\r\n]*)", re.MULTILINE)
+_TEXTURE_NORMAL = re.compile(rb"/\S*")
+_SPACES = re.compile(rb"[ \t]+")
+
+
+def parse_obj(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the vertices and the faces of a Wavefront .obj file.
+    Faces with any number of vertices are split in triangles around their first
+    vertex, negative indexes count back from the last vertex defined before the
+    face, and the faces with two vertices in the same position are removed.
+
+    :param data: content of the file
+    :type data: bytes
+    :return: vertices with shape (N, 3) and faces with shape (F, 3)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+
+    vertex_lines = _VERTEX.findall(data)
+    face_lines = _FACE.findall(data)
+
+    vertices = np.fromstring(b" ".join(vertex_lines), dtype=np.float32, sep=" ")
+
+    if len(vertices) != 3 * len(vertex_lines):
+        # some vertices have a w coordinate or a color
+        vertices = np.array([line.split()[:3] for line in vertex_lines], dtype=np.float32)
+
+    vertices = vertices.reshape(-1, 3)
+
+    if face_lines:
+        face_lines = _SPACES.sub(b" ", _TEXTURE_NORMAL.sub(b"", b"\n".join(face_lines)))
+        face_lines = face_lines.split(b"\n")
+
+    counts = np.array([line.strip().count(b" ") + 1 if line.strip() else 0
+                       for line in face_lines], dtype=np.int64)
+    indexes = np.fromstring(b" ".join(face_lines), dtype=np.int64, sep=" ")
+    negative = indexes < 0
+
+    if negative.any():
+        # number of vertices defined before each face
+        vertex_starts = [match.start() for match in _VERTEX.finditer(data)]
+        face_starts = [match.start() for match in _FACE.finditer(data)]
+        bases = np.repeat(np.searchsorted(vertex_starts, face_starts), counts)
+        indexes = np.where(negative, bases + indexes, indexes - 1)
+    else:
+        indexes -= 1
+
+    # fan of k - 2 triangles for each face with k vertices
+    triangles = np.maximum(counts - 2, 0)
+    starts = np.cumsum(counts) - counts
+    first = np.repeat(starts, triangles)
+    corner = np.arange(triangles.sum()) - np.repeat(np.cumsum(triangles) - triangles, triangles)
+    faces = np.column_stack((indexes[first],
+                             indexes[first + corner + 1],
+                             indexes[first + corner + 2]))
+
+    valid = ((faces >= 0) & (faces < len(vertices))).all(axis=1)
+    faces = faces[valid]
+    points = vertices[faces]
+    valid = ~((points[:, 0] == points[:, 1]).all(axis=1) |
+              (points[:, 1] == points[:, 2]).all(axis=1) |
+              (points[:, 2] == points[:, 0]).all(axis=1))
+
+    return vertices, faces[valid].astype(np.int32)
+
+
+def load_obj(obj_file: str, cache: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Load the vertices and the faces of a Wavefront .obj file, see :func:`parse_obj`.
+    The parsed arrays are cached in a .npz file next to the .obj one, which is
+    used instead of parsing while the size and modification time of the .obj match
+    and ignored when it cannot be read.
+
+    :param obj_file: path to the .obj file
+    :type obj_file: str
+    :param cache: read and write the cache, defaults to True
+    :type cache: bool, optional
+    :return: vertices with shape (N, 3) and faces with shape (F, 3)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+
+    cache_file = obj_file + ".npz"
+    stat = os.stat(obj_file)
+    stamp = np.array((stat.st_size, stat.st_mtime_ns), dtype=np.int64)
+
+    if cache and os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                if np.array_equal(cached["stamp"], stamp):
+                    return cached["vertices"], cached["faces"]
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # unreadable cache, written again below
+            pass
+
+    with open(obj_file, "rb") as file:
+        vertices, faces = parse_obj(file.read())
+
+    if cache:
+        try:
+            with open(cache_file, "wb") as file:
+                np.savez(file, vertices=vertices, faces=faces, stamp=stamp)
+        except OSError:
+            pass
+
+    return vertices, faces
+
+
+# header of the binary meshes, followed by the float32 vertices (N, 3),
+# the int32 faces (F, 3) and the uint8 colors of the faces (F, 3)
+MESH_MAGIC = b"P3DM"
+MESH_VERSION = 1
+_MESH_HEADER = np.dtype([("magic", "S4"), ("version", "<u4"),
+                         ("vertices", "<u4"), ("faces", "<u4")])
+
+
+def save_mesh(
+    mesh_file: str,
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    colors: np.ndarray) -> None:
+    """
+    Write a mesh in the binary format read by :func:`load_mesh`.
+
+    :param mesh_file: path of the file
+    :type mesh_file: str
+    :param vertices: vertices with shape (N, 3)
+    :type vertices: np.ndarray
+    :param faces: indexes of the vertices of each face with shape (F, 3)
+    :type faces: np.ndarray
+    :param colors: color of each face with shape (F, 3)
+    :type colors: np.ndarray
+    """
+
+    header = np.array((MESH_MAGIC, MESH_VERSION, len(vertices), len(faces)), dtype=_MESH_HEADER)
+
+    with open(mesh_file, "wb") as file:
+        header.tofile(file)
+        np.ascontiguousarray(vertices, dtype="<f4").tofile(file)
+        np.ascontiguousarray(faces, dtype="<i4").tofile(file)
+        np.ascontiguousarray(colors, dtype=np.uint8).tofile(file)
+
+
+def load_mesh(mesh_file: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Map a mesh written by :func:`save_mesh` in memory without reading it.
+    The arrays are copy on write: the pages of the file are shared by all the
+    processes that load it and changes to the arrays never reach the file.
+
+    :param mesh_file: path of the file
+    :type mesh_file: str
+    :return: vertices with shape (N, 3), faces with shape (F, 3)
+        and colors with shape (F, 3)
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+
+    header = np.fromfile(mesh_file, dtype=_MESH_HEADER, count=1)
+
+    if len(header) == 0 or header["magic"][0] != MESH_MAGIC or \
+            header["version"][0] != MESH_VERSION:
+        raise ValueError(f"{mesh_file} is not a py3dgame mesh")
+
+    n_vertices = int(header["vertices"][0])
+    n_faces = int(header["faces"][0])
+    faces_offset = _MESH_HEADER.itemsize + 12 * n_vertices
+    colors_offset = faces_offset + 12 * n_faces
+
+    vertices = np.memmap(mesh_file, dtype="<f4", mode="c",
+                         offset=_MESH_HEADER.itemsize, shape=(n_vertices, 3))
+    faces = np.memmap(mesh_file, dtype="<i4", mode="c", offset=faces_offset, shape=(n_faces, 3))
+    colors = np.memmap(mesh_file, dtype=np.uint8, mode="c", offset=colors_offset,
+                       shape=(n_faces, 3))
+
+    return vertices, faces, colors
@@ -0,0 +1,928 @@
+"""
+Bodies, the meshes placed in the scene.
+"""
+
+import math
+from typing import Union
+import numpy as np
+from .color import WHITE, Color, RED, BLUE, GREEN
+from .math3d import Vec3, Quat, rotate, rotate_array
+from .simplify import simplify
+from .assets import load_obj, load_mesh, save_mesh
+
+
+def vertices_array(vertices: Union[tuple[Vec3], np.ndarray]) -> np.ndarray:
+    """
+    Convert vertices to a contiguous float32 array.
+
+    :param vertices: vertices as :class:`Vec3` or as an array with shape (N, 3)
+    :type vertices: tuple[Vec3], np.ndarray
+    :return: vertices with shape (N, 3)
+    :rtype: np.ndarray
+    """
+
+    if isinstance(vertices, np.ndarray):
+        return np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+
+    return np.array([(v.x, v.y, v.z) for v in vertices], dtype=np.float32).reshape(-1, 3)
+
+
+def face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Compute the unit normals of the faces of a mesh.
+
+    :param vertices: vertices with shape (N, 3)
+    :type vertices: np.ndarray
+    :param faces: indexes of the vertices of each face with shape (F, 3)
+    :type faces: np.ndarray
+    :return: normals with shape (F, 3)
+    :rtype: np.ndarray
+    """
+
+    v1 = vertices[faces[:, 0]]
+    normals = np.cross(vertices[faces[:, 2]] - v1, vertices[faces[:, 1]] - v1)
+    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+
+    return normals / norms
+
+
+class Body:
+    """
+    Class to store information about physical entities.
+
+    :param name: unique name that identifies the body
+    :type name: str
+    :param vertices: vertices of the body, as :class:`Vec3` or as an array with shape (N, 3)
+    :type vertices: tuple[Vec3], np.ndarray
+    :param faces: faces of the body as tuples of indexes of the vertices
+        or as an array with shape (F, 3)
+    :type faces: tuple[tuple[int]], np.ndarray
+    :param pos: initial position of the body, defaults to Vec3(0, 0, 0)
+    :type pos: Vec3, optional
+    :param rot: initial roatation of the body, defaults to Quat(0, Vec3(0, 0, 1))
+    :type rot: Quat, optional
+    :param color: color of the body, can be a single color, a tuple
+        with one color for each face or an array with shape (F, 3), defaults to color.WHITE
+    :type color: Color, tuple[Color], np.ndarray, optional
+
+    ``version`` is increased each time the body is moved or its mesh or color
+    change, changes made writing directly in its arrays are not tracked.
+    """
+
+    __slots__ = ["name", "pos", "rot", "_color", "single_color",
+                 "vertices_arr", "normals_arr", "_v_arr", "_n_arr", "f_arr", "c_arr",
+                 "first_rotate", "dirty", "local_center", "local_extent",
+                 "center", "radius", "aabb_min", "aabb_max", "index",
+                 "proj", "proj_stamp", "lods", "lod", "version", "static_scene"]
+
+    def __init__(
+        self,
+        name: str,
+        vertices: Union[tuple[Vec3], np.ndarray],
+        faces: Union[tuple[tuple[int, int, int]], np.ndarray],
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        color: Union[Color, tuple[Color], np.ndarray] = WHITE) -> None:
+
+        self.name = name
+        self.pos = pos
+        self.rot = rot
+        self.index = None
+        self.static_scene = None
+        self.version = 0
+
+        self.vertices_arr = vertices_array(vertices)
+        self.f_arr = np.ascontiguousarray(faces, dtype=np.int32).reshape(-1, 3)
+        self.lods = []
+        self.lod = 0
+        self._v_arr = self.vertices_arr
+        self.proj = np.empty_like(self.vertices_arr)
+        self.proj_stamp = None
+        self.dirty = False
+        self.compute_normals()
+        self.normals_arr = self._n_arr
+        self.color = color
+
+        if len(self.vertices_arr) > 0:
+            low = self.vertices_arr.min(axis=0)
+            high = self.vertices_arr.max(axis=0)
+        else:
+            low = high = np.zeros(3, dtype=np.float32)
+
+        self.local_center = (low + high) / 2
+        self.local_extent = (high - low) / 2
+        self.radius = float(np.linalg.norm(self.vertices_arr - self.local_center, axis=1).max(
+            initial=0))
+        self.center = self.local_center
+        self.aabb_min = low
+        self.aabb_max = high
+        self.first_rotate = True
+        self.move()
+
+    @property
+    def v_arr(self) -> np.ndarray:
+        """
+        Vertices of the body in world coordinates with shape (N, 3),
+        computed when first needed after the body has been moved.
+        """
+
+        if self.dirty:
+            self.update_world()
+
+        return self._v_arr
+
+    @property
+    def n_arr(self) -> np.ndarray:
+        """
+        Normals of the faces in world coordinates with shape (F, 3),
+        computed when first needed after the body has been moved.
+        """
+
+        if self.dirty:
+            self.update_world()
+
+        return self._n_arr
+
+    @property
+    def vertices(self) -> tuple[Vec3]:
+        """
+        Vertices of the body in its own reference system.
+        """
+
+        return tuple(Vec3(*vertex) for vertex in self.vertices_arr.tolist())
+
+    @property
+    def v(self) -> tuple[Vec3]:
+        """
+        Vertices of the body in world coordinates.
+        """
+
+        return tuple(Vec3(*vertex) for vertex in self.v_arr.tolist())
+
+    @property
+    def n(self) -> tuple[Vec3]:
+        """
+        Normals of the faces of the body in world coordinates.
+        """
+
+        return tuple(Vec3(*normal) for normal in self.n_arr.tolist())
+
+    @property
+    def f(self) -> tuple[tuple[int, int, int]]:
+        """
+        Faces of the body as tuples of indexes of the vertices.
+        """
+
+        return tuple(tuple(face) for face in self.f_arr.tolist())
+
+    @property
+    def color(self) -> Union[Color, tuple[Color], np.ndarray]:
+        """
+        Color of the body, a single color or one color for each face
+        as a tuple or as an array with shape (F, 3).
+        A single color paints every level of detail, colors for each face
+        are for the faces of the current level and the other levels keep theirs.
+        """
+
+        return self._color
+
+    @color.setter
+    def color(self, color: Union[Color, tuple[Color], np.ndarray]) -> None:
+        self._color = color
+        self.changed()
+
+        if isinstance(color, np.ndarray) and color.ndim == 2:
+            self.single_color = False
+            self.c_arr = np.ascontiguousarray(color, dtype=np.uint8)
+        else:
+            self.single_color = not isinstance(color[0], tuple)
+            self.c_arr = np.empty((len(self.f_arr), 3), dtype=np.uint8)
+            self.c_arr[:] = color
+
+        if self.lods:
+            self.lods[self.lod] = self.lods[self.lod][:4] + (self.c_arr,)
+
+        if self.lods and self.single_color:
+            for i, level in enumerate(self.lods):
+                if i != self.lod:
+                    colors = np.empty((len(level[3]), 3), dtype=np.uint8)
+                    colors[:] = color
+                    self.lods[i] = level[:4] + (colors,)
+
+    def changed(self) -> None:
+        """
+        Increase ``version`` after the body changed, when it is static
+        the batches of its scene are built again when next needed.
+        """
+
+        self.version += 1
+
+        if self.static_scene is not None:
+            self.static_scene.batches = None
+
+    def compute_normals(self):
+        """
+        Computes the normals for each face of the body from its world vertices.
+        """
+
+        self._n_arr = face_normals(self.v_arr, self.f_arr)
+
+    def add_lod(
+        self,
+        vertices: Union[tuple[Vec3], np.ndarray],
+        faces: Union[tuple[tuple[int, int, int]], np.ndarray],
+        size: float,
+        color: Union[Color, tuple[Color]] = None) -> None:
+        """
+        Add a coarser mesh, a level of detail drawn instead of the full mesh when
+        the body covers less than a given size on the screen.
+        The bounds of the body stay the ones of the full mesh.
+
+        :param vertices: vertices of the mesh in the body reference system
+        :type vertices: tuple[Vec3], np.ndarray
+        :param faces: faces of the mesh
+        :type faces: tuple[tuple[int]], np.ndarray
+        :param size: size in pixels below which the mesh is used
+        :type size: float
+        :param color: color of the mesh, a single color or one for each face,
+            defaults to the color of the body or to its first color
+        :type color: Color, tuple[Color], optional
+        """
+
+        if not self.lods:
+            self.lods.append((math.inf, self.vertices_arr, self.normals_arr,
+                              self.f_arr, self.c_arr))
+
+        if color is None:
+            color = self.color if self.single_color else self.color[0]
+
+        vertices = vertices_array(vertices)
+        faces = np.ascontiguousarray(faces, dtype=np.int32).reshape(-1, 3)
+        colors = np.empty((len(faces), 3), dtype=np.uint8)
+        colors[:] = color
+        active = self.lods[self.lod]
+
+        self.lods.append((size, vertices, face_normals(vertices, faces), faces, colors))
+        self.lods.sort(key=lambda level: - level[0])
+        self.lod = next(i for i, level in enumerate(self.lods) if level is active)
+
+    def simplified(
+        self,
+        ratio: float = 0.5,
+        max_error: float = math.inf,
+        name: str = None) -> 'Body':
+        """
+        Create a copy of the body with a simplified mesh, see :func:`simplify.simplify`.
+
+        :param ratio: fraction of the faces to keep, defaults to 0.5
+        :type ratio: float, optional
+        :param max_error: largest distance from the original surface, defaults to math.inf
+        :type max_error: float, optional
+        :param name: name of the new body, defaults to the name of this one
+        :type name: str, optional
+        :return: the simplified body, in the same position
+        :rtype: Body
+        """
+
+        vertices, faces, colors = self._full_mesh()
+        vertices, faces, source = simplify(vertices, faces, int(len(faces) * ratio), max_error)
+        color = self.color if self.single_color else tuple(map(tuple, colors[source].tolist()))
+
+        return Body(self.name if name is None else name, vertices, faces,
+                    self.pos, self.rot, color)
+
+    def generate_lods(
+        self,
+        sizes: tuple[float],
+        ratio: float = 0.5,
+        max_error: float = math.inf) -> None:
+        """
+        Add levels of detail simplifying the mesh, each level keeps
+        a fraction of the faces of the previous one.
+
+        :param sizes: sizes in pixels below which the levels are used, from the finest
+        :type sizes: tuple[float]
+        :param ratio: fraction of the faces kept by each level, defaults to 0.5
+        :type ratio: float, optional
+        :param max_error: largest distance of each level from the previous one,
+            defaults to math.inf
+        :type max_error: float, optional
+        """
+
+        vertices, faces, colors = self._full_mesh()
+
+        for size in sizes:
+            vertices, faces, source = simplify(vertices, faces, int(len(faces) * ratio),
+                                               max_error)
+            colors = colors[source]
+            self.add_lod(vertices, faces, size, tuple(map(tuple, colors.tolist())))
+
+    def _full_mesh(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self.lods:
+            return self.lods[0][1], self.lods[0][3], self.lods[0][4]
+
+        return self.vertices_arr, self.f_arr, self.c_arr
+
+    def select_lod(self, size: float, hysteresis: float = 0.2) -> int:
+        """
+        Select the level of detail for the size of the body on the screen.
+        A level is left only when the size is beyond its limit by the
+        hysteresis fraction, so a body near a limit does not switch every frame.
+
+        :param size: size of the body on the screen in pixels
+        :type size: float
+        :param hysteresis: fraction of the limits of the levels, defaults to 0.2
+        :type hysteresis: float, optional
+        :return: index of the selected level, 0 is the full mesh
+        :rtype: int
+        """
+
+        level = self.lod
+
+        while level + 1 < len(self.lods) and size < self.lods[level + 1][0] * (1 - hysteresis):
+            level += 1
+
+        while level > 0 and size > self.lods[level][0] * (1 + hysteresis):
+            level -= 1
+
+        if level != self.lod:
+            self.set_lod(level)
+
+        return level
+
+    def set_lod(self, level: int) -> None:
+        """
+        Make a level of detail the mesh of the body.
+        Its world coordinates are computed from the position and rotation
+        of the body when first needed.
+
+        :param level: index of the level, 0 is the full mesh
+        :type level: int
+        """
+
+        _, self.vertices_arr, self.normals_arr, self.f_arr, self.c_arr = self.lods[level]
+        self.lod = level
+        self.proj = np.empty_like(self.vertices_arr)
+        self.proj_stamp = None
+        self.dirty = True
+        self.changed()
+
+    def update_world(self) -> None:
+        """
+        Compute the vertices and the normals in world coordinates according to
+        the position and rotation stored in the instance.
+        """
+
+        pos = np.array((self.pos.x, self.pos.y, self.pos.z), dtype=np.float32)
+
+        if self.first_rotate:
+            self._v_arr = rotate_array(self.vertices_arr, self.rot) + pos
+        else:
+            self._v_arr = rotate_array(self.vertices_arr + pos, self.rot)
+
+        self._n_arr = rotate_array(self.normals_arr, self.rot)
+        self.dirty = False
+
+    def move(self, pos: Vec3 = None, rot: Quat = None, first_rotate: bool = True) -> None:
+        """
+        Move the body to a given position an with a certain rotation.
+        If no arguments are passed will move the body according to the
+        position and rotation stored in the instance.
+        The world coordinates are only computed when they are first needed,
+        so moving a body more than once before rendering it costs nothing.
+
+        :param pos: target position, defaults to None
+        :type pos: Vec3, optional
+        :param rot: target rotation, defaults to None
+        :type rot: Quat, optional
+        """
+
+        if pos is not None:
+            self.pos = pos
+
+        if rot is not None:
+            self.rot = rot
+
+        self.first_rotate = first_rotate
+        self.dirty = True
+        self.changed()
+        self.update_bounds()
+
+    def update_bounds(self) -> None:
+        """
+        Update the bounding sphere (``center`` and ``radius``) and the axis aligned
+        bounding box (``aabb_min`` and ``aabb_max``) in world coordinates.
+        Only the bounds computed in the body reference system are transformed,
+        so it does not need the world vertices.
+        """
+
+        pos = np.array((self.pos.x, self.pos.y, self.pos.z), dtype=np.float32)
+        matrix = self.rot.matrix()
+
+        if self.first_rotate:
+            self.center = matrix @ self.local_center + pos
+        else:
+            self.center = matrix @ (self.local_center + pos)
+
+        extent = np.abs(matrix) @ self.local_extent
+        self.aabb_min = self.center - extent
+        self.aabb_max = self.center + extent
+
+        if self.index is not None:
+            self.index.update(self)
+
+    def traslate(self, pos: Vec3):
+        """
+        Traslate the body of a certain amout with
+        respect to the current position.
+
+        :param pos: traslation amount
+        :type pos: Vec3
+        """
+
+        self.pos = self.pos + pos
+        self.move()
+
+    def rotate(self, angle: float) -> None:
+        """
+        Rotate around the current axis of a given
+        amount starting from the actual one.
+
+        :param angle: angle in rad
+        :type angle: float
+        """
+
+        self.rot = Quat(self.rot.angle + angle, self.rot.axis)
+        self.move()
+
+    def rotate_deg(self, angle: float) -> None:
+        """
+        Rotate around the current axis of a given
+        amount starting from the actual one.
+
+        :param angle: angle in rad
+        :type angle: float
+        """
+        self.rotate(angle * math.pi / 180)
+
+    def relative_move(
+        self,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        first_rotate: bool = True) -> None:
+        """
+        Move the body relatively to its actual position.
+        The movement is added to the position and rotation of the body,
+        so it is kept when the world coordinates are computed again.
+
+        :param pos: additional position, defaults to None
+        :type pos: Vec3, optional
+        :param rot: additional rotation, defaults to None
+        :type rot: Quat, optional
+        :param first_rotate: rotate before adding ``pos``, defaults to True
+        :type first_rotate: bool, optional
+        """
+
+        # position of the body when the rotation is applied first
+        current = self.pos if self.first_rotate else rotate(self.pos, self.rot)
+
+        if first_rotate:
+            current = rotate(current, rot) + pos
+        else:
+            current = rotate(current + pos, rot)
+
+        quat = self.rot * rot
+        norm = math.sqrt(quat.x * quat.x + quat.y * quat.y + quat.z * quat.z)
+        axis = Vec3(quat.x, quat.y, quat.z) if norm > 0 else Vec3(0, 0, 1)
+
+        self.move(current, Quat(2 * math.atan2(norm, quat.w), axis))
+
+    @classmethod
+    def from_obj(
+        cls,
+        obj_file: str,
+        name: str = None,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        cache: bool = True) -> 'Body':
+        """
+        Generate a :class:`Body` from a .obj file, see :func:`assets.load_obj`.
+
+        :param obj_file: path to the .obj file
+        :type obj_file: str
+        :param cache: keep the parsed mesh in a .npz file next to the .obj one,
+            defaults to True
+        :type cache: bool, optional
+        :return: instance of the class
+        :rtype: Body
+        """
+
+        if name is None:
+            name = obj_file
+
+        vertices, faces = load_obj(obj_file, cache)
+
+        return cls(name, vertices, faces, pos, rot, WHITE)
+
+    def save(self, mesh_file: str) -> None:
+        """
+        Save the full mesh and the colors of the body in the binary format
+        read by :meth:`Body.load`, see :func:`assets.save_mesh`.
+        The levels of detail are not saved.
+
+        :param mesh_file: path of the file
+        :type mesh_file: str
+        """
+
+        save_mesh(mesh_file, *self._full_mesh())
+
+    @classmethod
+    def load(
+        cls,
+        mesh_file: str,
+        name: str = None,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1))) -> 'Body':
+        """
+        Generate a :class:`Body` from a file written by :meth:`Body.save`.
+        The mesh is mapped in memory instead of being read, see :func:`assets.load_mesh`.
+
+        :param mesh_file: path of the file
+        :type mesh_file: str
+        :return: instance of the class
+        :rtype: Body
+        """
+
+        if name is None:
+            name = mesh_file
+
+        vertices, faces, colors = load_mesh(mesh_file)
+
+        if len(colors) > 0 and (colors == colors[0]).all():
+            colors = tuple(colors[0].tolist())
+
+        return cls(name, vertices, faces, pos, rot, colors if len(colors) > 0 else WHITE)
+
+    @classmethod
+    def logo(
+        cls,
+        name: str,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1))) -> 'Body':
+        """
+        Create Py3dGame logo.
+
+        :param name: unique name that identifies the body
+        :type name: str
+        :param pos: position of the origin of the body in the world reference system,
+            defaults to Vec3(0, 0, 0)
+        :type pos: Vec3, optional
+        :param rot: rotation of the body, defaults to Quat(0, Vec3(0, 0, 1))
+        :type rot: Quat, optional
+        :return: instance of the Body class
+        :rtype: Body
+        """
+
+        vertices = (
+            # 0
+            Vec3(5, 5, 3),
+            Vec3(5, 5, 5),
+            Vec3(5, -5, 5),
+            Vec3(5, -5, -1),
+            Vec3(5, -3, -1),
+            Vec3(5, -3, 3),
+            Vec3(5, 5, 1),
+            Vec3(5, 5, -1),
+            Vec3(5, 3, -1),
+            Vec3(5, 3, 1),
+            # 10
+            Vec3(1, 3, 1),
+            Vec3(1, 3, -1),
+            Vec3(1, 1, -1),
+            Vec3(1, 1, 1),
+            Vec3(-3, 3, 5),
+            Vec3(-3, 3, 3),
+            Vec3(-3, -3, 3),
+            Vec3(-3, -5, 5),
+            Vec3(-3, -5, -5),
+            Vec3(-3, -3, -3),
+            # 20
+            Vec3(-3, 3, -3),
+            Vec3(-3, 5, -5),
+            Vec3(-3, 5, -1),
+            Vec3(-3, 3, -1),
+            Vec3(3, 3, 5),
+            Vec3(3, 3, 3),
+            Vec3(-1, 1, 1),
+            Vec3(-1, 1, -1),
+            Vec3(-5, 3, -3),
+            Vec3(-1, 3, 1),
+            # 30
+            Vec3(-1, 3, -1),
+            Vec3(3, -5, 5),
+            Vec3(3, -5, -1),
+            Vec3(-5, 3, 1),
+            Vec3(-5, -5, -5),
+            Vec3(-5, -5, 5),
+            Vec3(-5, 5, 5),
+            Vec3(-5, -3, -3),
+            Vec3(-5, 5, 1),
+            Vec3(-5, 5, 3),
+            # 40
+            Vec3(-5, -3, 3),
+            Vec3(3, -3, -1),
+            Vec3(-5, 5, -5),
+            Vec3(3, -3, 3)
+        )
+
+        faces = (
+            # 16 blue faces
+            (0, 1, 2),
+            (0, 2, 5),
+            (2, 3, 4),
+            (2, 4, 5),
+            (6, 8, 7),
+            (6, 9, 8),
+            (10, 12, 11),
+            (10, 13, 12),
+            (16, 15, 14),
+            (17, 16, 14),
+            (16, 17, 18),
+            (16, 18, 19),
+            (19, 18, 21),
+            (19, 21, 20),
+            (20, 21, 23),
+            (21, 22, 23),
+            # 14 red faces
+            (8, 9, 10),
+            (8, 10, 11),
+            (12, 13, 26),
+            (12, 26, 27),
+            (23, 30, 29),
+            (23, 29, 33),
+            (20, 23, 33),
+            (20, 33, 28),
+            (3, 2, 31),
+            (3, 31, 32),
+            (17, 35, 18),
+            (18, 35, 34),
+            (25, 24, 14),
+            (25, 14, 15),
+            # 12 green faces
+            (2, 1, 24),
+            (2, 24, 31),
+            (1, 36, 24),
+            (24, 36, 14),
+            (14, 36, 35),
+            (14, 35, 17),
+            (20, 28, 19),
+            (19, 28, 37),
+            (6, 38, 9),
+            (9, 38, 33),
+            (10, 29, 13),
+            (13, 29, 26),
+            # 10 white faces (opposite to red)
+            (1, 0, 36),
+            (36, 0, 39),
+            (6, 7, 38),
+            (38, 7, 22),
+            (38, 22, 42),
+            (22, 21, 42),
+            (5, 4, 43),
+            (4, 41, 43),
+            (40, 16, 19),
+            (40, 19, 37),
+            # 14 white faces (opposite to blue)
+            (29, 30, 27),
+            (26, 29, 27),
+            (24, 25, 43),
+            (43, 31, 24),
+            (43, 32, 31),
+            (43, 41, 32),
+            (38, 42, 28),
+            (33, 38, 28),
+            (28, 42, 34),
+            (28, 34, 37),
+            (37, 34, 35),
+            (35, 36, 40),
+            (36, 39, 40),
+            (35, 40, 37),
+            # 14 white faces (opposite to green)
+            (7, 8, 22),
+            (8, 23, 22),
+            (11, 12, 30),
+            (12, 27, 30),
+            (4, 3, 32),
+            (4, 32, 41),
+            (21, 18, 42),
+            (18, 34, 42),
+            (15, 16, 40),
+            (15, 40, 39),
+            (39, 25, 15),
+            (0, 25, 39),
+            (0, 5, 25),
+            (5, 43, 25)
+        )
+
+        color = (
+            BLUE, BLUE, BLUE, BLUE, BLUE, BLUE, BLUE, BLUE,
+            BLUE, BLUE, BLUE, BLUE, BLUE, BLUE, BLUE, BLUE,
+            RED, RED, RED, RED, RED, RED, RED,
+            RED, RED, RED, RED, RED, RED, RED,
+            GREEN, GREEN, GREEN, GREEN, GREEN, GREEN,
+            GREEN, GREEN, GREEN, GREEN, GREEN, GREEN,
+            WHITE, WHITE, WHITE, WHITE, WHITE,
+            WHITE, WHITE, WHITE, WHITE, WHITE,
+            WHITE, WHITE, WHITE, WHITE, WHITE, WHITE, WHITE,
+            WHITE, WHITE, WHITE, WHITE, WHITE, WHITE, WHITE,
+            WHITE, WHITE, WHITE, WHITE, WHITE, WHITE, WHITE,
+            WHITE, WHITE, WHITE, WHITE, WHITE, WHITE, WHITE
+        )
+
+        return cls(name, vertices, faces, pos, rot, color)
+
+    @classmethod
+    def cube(
+        cls,
+        name: str,
+        dim: float,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        color: Color = WHITE) -> 'Body':
+        """
+        Constructor method that generates a cube with a specific dimension.
+
+        :param name: unique name that identifies the body
+        :type name: str
+        :param dim: length of the cube edges
+        :type dim: float
+        :param pos: position of the origin of the body in the world reference system,
+            defaults to Vec3(0, 0, 0)
+        :type pos: Vec3, optional
+        :param rot: rotation of the body, defaults to Quat(0, Vec3(0, 0, 1))
+        :type rot: Quat, optional
+        :param color: if a tuple with 3 values is used each face of the body will use that color,
+            to assign a specific color to each face use a `tuple` containing 6 `tuples`
+            representing the RGB triplet for each face, defaults to Color.white
+        :type color: tuple, optional
+        :return: instance of the class
+        :rtype: Body
+        """
+
+        dim = dim / 2
+        vertices = (
+            Vec3(dim, dim, dim),
+            Vec3(dim, - dim, - dim),
+            Vec3(dim, dim, - dim),
+            Vec3(dim, - dim, dim),
+            Vec3(- dim, dim, - dim),
+            Vec3(- dim, dim, dim),
+            Vec3(- dim, - dim, dim),
+            Vec3(- dim, - dim, - dim)
+        )
+        faces = (
+            (0, 1, 2),
+            (0, 3, 1),
+            (1, 3, 6),
+            (1, 6, 7),
+            (5, 0, 2),
+            (5, 2, 4),
+            (6, 5, 4),
+            (7, 6, 4),
+            (0, 5, 6),
+            (0, 6, 3),
+            (2, 7, 4),
+            (2, 1, 7)
+        )
+
+        if isinstance(color[0], tuple):
+            color = (
+                color[0],
+                color[0],
+                color[1],
+                color[1],
+                color[2],
+                color[2],
+                color[3],
+                color[3],
+                color[4],
+                color[4],
+                color[5],
+                color[5]
+            )
+
+        return cls(name, vertices, faces, pos, rot, color)
+
+    @classmethod
+    def sphere(
+        cls,
+        name: str,
+        radius: float,
+        quality: int = 1,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        color: Color = WHITE) -> 'Body':
+        """
+        Constructor method that generates a sphere with a specific radius.
+
+        :param name: unique name that identifies the body
+        :type name: str
+        :param radius: radius of the sphere
+        :type radius: float
+        :param quality: define the dfinition of the mesh, defaults to 1, minimum 0
+        :type quality: int, optional
+        :param pos: position of the origin of the body in the world reference system,
+            defaults to Vec3(0, 0, 0)
+        :type pos: Vec3, optional
+        :param rot: rotation of the body, defaults to Quat(0, Vec3(0, 0, 1))
+        :type rot: Quat, optional
+        :param color: if a tuple with 3 values is used each face of the body will use that color,
+            to assign a specific color to each face use a `tuple` containing 6 `tuples`
+            representing the RGB triplet for each face, defaults to Color.white
+        :type color: tuple, optional
+        :return: instance of the class
+        :rtype: Body
+        """
+
+        t = (1 + 5 ** 0.5) / 2
+
+        vertices = [
+            Vec3(-1,  t,  0),
+            Vec3( 1,  t,  0),
+            Vec3(-1, -t,  0),
+            Vec3( 1, -t,  0),
+            Vec3( 0, -1,  t),
+            Vec3( 0,  1,  t),
+            Vec3( 0, -1, -t),
+            Vec3( 0,  1, -t),
+            Vec3( t,  0, -1),
+            Vec3( t,  0,  1),
+            Vec3(-t,  0, -1),
+            Vec3(-t,  0,  1),
+        ]
+
+        faces = [
+             (0, 11, 5),
+             (0, 5, 1),
+             (0, 1, 7),
+             (0, 7, 10),
+             (0, 10, 11),
+             (1, 5, 9),
+             (5, 11, 4),
+             (11, 10, 2),
+             (10, 7, 6),
+             (7, 1, 8),
+             (3, 9, 4),
+             (3, 4, 2),
+             (3, 2, 6),
+             (3, 6, 8),
+             (3, 8, 9),
+             (4, 9, 5),
+             (2, 4, 11),
+             (6, 2, 10),
+             (8, 6, 7),
+             (9, 8, 1),
+        ]
+
+        mid_cache = dict()
+
+        def get_mid_points(a, b):
+            key = math.floor((a + b) * (a + b + 1) / 2) + min(a, b)
+
+            if key in mid_cache:
+                return mid_cache[key]
+
+            mid_cache[key] = len(vertices)
+
+            vertices.append(Vec3(
+                (vertices[a].x + vertices[b].x) / 2,
+                (vertices[a].y + vertices[b].y) / 2,
+                (vertices[a].z + vertices[b].z) / 2,
+            ))
+
+            return len(vertices) - 1
+
+        prev_faces = faces
+
+        for i in range(quality):
+            faces = [0] * (len(prev_faces) * 4)
+
+            for k, face in enumerate(prev_faces):
+                v1 = face[0]
+                v2 = face[1]
+                v3 = face[2]
+                a = get_mid_points(v1, v2)
+                b = get_mid_points(v2, v3)
+                c = get_mid_points(v3, v1)
+                faces[k * 4] = (v1, a, c)
+                faces[k * 4 + 1] = (v2, b, a)
+                faces[k * 4 + 2] = (v3, c, b)
+                faces[k * 4 + 3] = (a, b, c)
+
+            prev_faces = faces
+
+        for i, vertex in enumerate(vertices):
+            vertices[i] = vertex.normalize() * radius
+
+        return cls(name, tuple(vertices), tuple(faces), pos, rot, color)
@@ -0,0 +1,218 @@
+"""
+Camera moving in the scene and projecting it on the screen.
+"""
+
+import math
+from itertools import count
+import pygame
+import numpy as np
+from .math3d import Vec3, Quat, rotate
+from .body import Body
+
+
+# versions of the cameras, unique among all of them
+_versions = count(1)
+
+
+class Camera:
+    """
+    Class to handle the camera postion for the rendering.
+
+    :param pos: initial position of the camera, defaults to Vec3(0, 0, 0)
+    :type pos: Vec3, optional
+    :param direction: initial direction of the camera, defaults to Vec3(1, 0, 0)
+    :type direction: Vec3, optional
+
+    ``version`` is changed by :meth:`update_projection_space` and
+    :meth:`update_view_space` when they find the camera moved or
+    the projection changed, it is never the same for two cameras.
+    """
+
+    __slots__ = ["pos", "dir", "mouse_pos",
+                 "theta", "zfar", "znear",
+                 "w", "h", "a", "f", "q", "af",
+                 "up", "right", "tup", "tright", "tdir", "view", "view_offset", "frustum",
+                 "version", "projection_key", "view_key"]
+
+    def __init__(
+            self,
+            pos: Vec3 = Vec3(0, 0, 0),
+            direction: Vec3 = Vec3(1, 0, 0)) -> None:
+
+        self.pos = pos
+        self.dir = direction
+        self.mouse_pos = None
+
+        self.theta = math.pi / 2
+        self.zfar = 1000
+        self.znear = 0.1
+
+        self.w = 0
+        self.h = 0
+        self.a = 0
+        self.f = 0
+        self.q = 0
+        self.af = 0
+
+        self.up = Vec3(0, 0, 0)
+        self.right = Vec3(0, 0, 0)
+        self.tup = 0
+        self.tdir = 0
+        self.tright = 0
+        self.view = np.zeros((3, 3), dtype=np.float32)
+        self.view_offset = np.zeros(3, dtype=np.float32)
+        self.frustum = np.zeros((6, 4), dtype=np.float32)
+        self.version = 0
+        self.projection_key = None
+        self.view_key = None
+
+    def handle_movements(self, fps: float) -> None:
+        """
+        Move the mare position with A, W, S, D or the arrows and the
+        change the rotation using the mouse.
+        """
+
+        keys = pygame.key.get_pressed()
+        mouse_buttons = pygame.mouse.get_pressed()
+
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            self.pos = self.pos - self.right / fps
+
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            self.pos = self.pos + self.right / fps
+
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            self.pos = self.pos + self.dir / fps
+
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            self.pos = self.pos - self.dir / fps
+
+        if mouse_buttons[1]:
+            if self.mouse_pos is not None:
+                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = Vec3(mouse_pos[0], mouse_pos[1], 0)
+                angle = (self.mouse_pos - mouse_pos).x / 1000
+                self.dir = rotate(self.dir, Quat(angle, self.up))
+                self.update_view_space()
+
+                angle = (self.mouse_pos - mouse_pos).y / 1000
+                self.dir = rotate(self.dir, Quat(angle, self.right))
+                self.update_view_space()
+
+            mouse_pos = pygame.mouse.get_pos()
+            self.mouse_pos = Vec3(mouse_pos[0], mouse_pos[1], 0)
+        else:
+            self.mouse_pos = None
+
+    def update_projection_space(self, screen: pygame.Surface) -> None:
+        """
+        Update parameters for the computing the screen space.
+
+        :param screen: screen of the active window
+        :type screen: pygame.Surface
+        """
+
+        self.w = screen.get_width()
+        self.h = screen.get_height()
+        key = (self.w, self.h, self.theta, self.znear, self.zfar)
+
+        if key != self.projection_key:
+            self.projection_key = key
+            self.version = next(_versions)
+
+        self.a = self.h / self.w
+        self.f = 1 / math.tan(self.theta / 2)
+        self.q = self.zfar / (self.zfar - self.znear)
+        self.af = self.a * self.f
+
+    def update_view_space(self) -> None:
+        """
+        Update parameters to compute the view space.
+        """
+
+        key = (self.pos.x, self.pos.y, self.pos.z, self.dir.x, self.dir.y, self.dir.z)
+
+        if key != self.view_key:
+            self.view_key = key
+            self.version = next(_versions)
+
+        up = Vec3(0, 0, 1)
+        self.up = (up - (self.dir * (up * self.dir))).normalize()
+        self.right = self.dir @ self.up
+
+        target = self.pos + self.dir
+
+        self.tup = target * self.up
+        self.tdir = target * self.dir
+        self.tright = target * self.right
+
+        self.view = np.array(((self.right.x, self.right.y, self.right.z),
+                              (self.up.x, self.up.y, self.up.z),
+                              (self.dir.x, self.dir.y, self.dir.z)), dtype=np.float32)
+        self.view_offset = np.array((self.tright, self.tup, self.tdir), dtype=np.float32)
+        self.update_frustum()
+
+    def update_frustum(self) -> None:
+        """
+        Update the planes of the view frustum in world coordinates.
+        Each plane is stored as ``(a, b, c, d)`` and a point ``p`` is
+        inside the plane when ``a * p.x + b * p.y + c * p.z + d >= 0``.
+        It requires the projection and the view space to be up to date.
+        """
+
+        near = self.znear + self.znear / self.q if self.q else self.znear
+        far = self.znear + self.zfar / self.q if self.q else self.zfar
+
+        # planes in view space: left, right, bottom, top, near, far
+        planes = np.array((
+            (self.af, 0, 1, 0),
+            (- self.af, 0, 1, 0),
+            (0, self.f, 1, 0),
+            (0, - self.f, 1, 0),
+            (0, 0, 1, - near),
+            (0, 0, - 1, far)
+        ), dtype=np.float32)
+
+        self.frustum[:, :3] = planes[:, :3] @ self.view
+        self.frustum[:, 3] = planes[:, 3] - planes[:, :3] @ self.view_offset
+
+    def is_visible(self, body: Body) -> bool:
+        """
+        Check if the bounding volumes of a body intersect the view frustum.
+        The check is conservative, a body partially inside is visible.
+
+        :param body: body to check
+        :type body: Body
+        :return: False if the whole body is outside the view
+        :rtype: bool
+        """
+
+        normals = self.frustum[:, :3]
+        distance = normals @ body.center + self.frustum[:, 3]
+
+        if (distance < - body.radius * np.linalg.norm(normals, axis=1)).any():
+            return False
+
+        extent = (body.aabb_max - body.aabb_min) / 2
+        center = (body.aabb_max + body.aabb_min) / 2
+
+        return not (normals @ center + self.frustum[:, 3] + np.abs(normals) @ extent < 0).any()
+
+    def screen_size(self, body: Body) -> float:
+        """
+        Estimate the height in pixels covered by a body from its bounding sphere.
+        It requires the projection and the view space to be up to date.
+
+        :param body: body to measure
+        :type body: Body
+        :return: projected diameter of the bounding sphere, infinite if the
+            camera is inside it
+        :rtype: float
+        """
+
+        depth = float(self.view[2] @ body.center - self.view_offset[2])
+
+        if depth <= self.znear + body.radius:
+            return math.inf
+
+        return body.radius * self.f * self.h / depth
@@ -0,0 +1,233 @@
+"""
+Instances sharing the mesh of a body and merging of bodies in batches.
+"""
+
+import math
+from typing import Union
+import numpy as np
+from .color import Color
+from .math3d import Vec3, Quat
+from .body import Body
+
+
+class Instance:
+    """
+    Copy of a :class:`Body` that shares its mesh and only has its own position,
+    rotation and color, so many copies of a mesh cost the memory of one.
+    The renderer draws it transforming the shared vertices with a single matrix,
+    the world coordinates of the vertices are never stored.
+
+    :param name: unique name that identifies the instance
+    :type name: str
+    :param mesh: body whose mesh, normals, colors and levels of detail are shared
+    :type mesh: Body
+    :param pos: initial position of the instance, defaults to Vec3(0, 0, 0)
+    :type pos: Vec3, optional
+    :param rot: initial roatation of the instance, defaults to Quat(0, Vec3(0, 0, 1))
+    :type rot: Quat, optional
+    :param color: single color of the instance, defaults to the colors of the mesh
+    :type color: Color, optional
+    """
+
+    __slots__ = ["name", "mesh", "pos", "rot", "_color", "first_rotate", "version",
+                 "vertices_arr", "normals_arr", "f_arr", "c_arr", "lod",
+                 "matrix", "offset", "center", "radius", "aabb_min", "aabb_max", "index",
+                 "static_scene"]
+
+    def __init__(
+        self,
+        name: str,
+        mesh: Body,
+        pos: Vec3 = Vec3(0, 0, 0),
+        rot: Quat = Quat(0, Vec3(0, 0, 1)),
+        color: Color = None) -> None:
+
+        self.name = name
+        self.mesh = mesh
+        self.pos = pos
+        self.rot = rot
+        self.static_scene = None
+        self.version = 0
+        self.color = color
+        self.index = None
+        self.radius = mesh.radius
+        self.first_rotate = True
+
+        if mesh.lods:
+            self.set_lod(0)
+        else:
+            self.lod = 0
+            self.vertices_arr = mesh.vertices_arr
+            self.normals_arr = mesh.normals_arr
+            self.f_arr = mesh.f_arr
+            self.c_arr = mesh.c_arr
+
+        self.move()
+
+    @property
+    def lods(self) -> list[tuple]:
+        """
+        Levels of detail of the shared mesh, see :meth:`Body.add_lod`.
+        """
+
+        return self.mesh.lods
+
+    @property
+    def color(self) -> Color:
+        """
+        Single color of the instance, None to use the colors of the mesh.
+        """
+
+        return self._color
+
+    @color.setter
+    def color(self, color: Color) -> None:
+        self._color = color
+        self.changed()
+
+    select_lod = Body.select_lod
+    changed = Body.changed
+
+    def set_lod(self, level: int) -> None:
+        """
+        Make a level of detail of the shared mesh the one drawn for this instance.
+
+        :param level: index of the level, 0 is the full mesh
+        :type level: int
+        """
+
+        _, self.vertices_arr, self.normals_arr, self.f_arr, self.c_arr = self.mesh.lods[level]
+        self.lod = level
+        self.changed()
+
+    def move(self, pos: Vec3 = None, rot: Quat = None, first_rotate: bool = True) -> None:
+        """
+        Move the instance to a given position an with a certain rotation, see :meth:`Body.move`.
+        Only the transformation and the bounds are updated, not the vertices.
+
+        :param pos: target position, defaults to None
+        :type pos: Vec3, optional
+        :param rot: target rotation, defaults to None
+        :type rot: Quat, optional
+        """
+
+        if pos is not None:
+            self.pos = pos
+
+        if rot is not None:
+            self.rot = rot
+
+        self.first_rotate = first_rotate
+        self.changed()
+        self.matrix = self.rot.matrix()
+        self.offset = np.array((self.pos.x, self.pos.y, self.pos.z), dtype=np.float32)
+
+        if not first_rotate:
+            self.offset = self.matrix @ self.offset
+
+        self.center = self.matrix @ self.mesh.local_center + self.offset
+        extent = np.abs(self.matrix) @ self.mesh.local_extent
+        self.aabb_min = self.center - extent
+        self.aabb_max = self.center + extent
+
+        if self.index is not None:
+            self.index.update(self)
+
+    def traslate(self, pos: Vec3) -> None:
+        """
+        Traslate the instance of a certain amout with respect to the current position.
+
+        :param pos: traslation amount
+        :type pos: Vec3
+        """
+
+        self.pos = self.pos + pos
+        self.move()
+
+    def rotate(self, angle: float) -> None:
+        """
+        Rotate around the current axis of a given amount starting from the actual one.
+
+        :param angle: angle in rad
+        :type angle: float
+        """
+
+        self.rot = Quat(self.rot.angle + angle, self.rot.axis)
+        self.move()
+
+    def rotate_deg(self, angle: float) -> None:
+        """
+        Rotate around the current axis of a given amount starting from the actual one.
+
+        :param angle: angle in degrees
+        :type angle: float
+        """
+
+        self.rotate(angle * math.pi / 180)
+
+    @property
+    def v_arr(self) -> np.ndarray:
+        """
+        Vertices of the instance in world coordinates with shape (N, 3),
+        computed each time they are read.
+        """
+
+        return self.vertices_arr @ self.matrix.T + self.offset
+
+    @property
+    def n_arr(self) -> np.ndarray:
+        """
+        Normals of the faces in world coordinates with shape (F, 3),
+        computed each time they are read.
+        """
+
+        return self.normals_arr @ self.matrix.T
+
+
+def merge_bodies(name: str, bodies: list[Union[Body, Instance]]) -> Body:
+    """
+    Merge bodies in a single one with their vertices in world coordinates,
+    each body contributes the mesh of its current level of detail
+    and the instances with their own color are painted with it.
+
+    :param name: name of the merged body
+    :type name: str
+    :param bodies: bodies and instances to merge
+    :type bodies: list[Union[Body, Instance]]
+    :return: body in the origin with the faces and the colors of all the bodies
+    :rtype: Body
+    """
+
+    starts = np.cumsum([0] + [len(body.v_arr) for body in bodies[:-1]])
+    vertices = np.concatenate([body.v_arr for body in bodies])
+    faces = np.concatenate([body.f_arr + start for body, start in zip(bodies, starts)])
+    colors = np.concatenate([
+        np.broadcast_to(np.array(body.color, dtype=np.uint8), body.c_arr.shape)
+        if isinstance(body, Instance) and body.color is not None else body.c_arr
+        for body in bodies])
+
+    return Body(name, vertices, faces, color=colors)
+
+
+def split_batches(bodies: list[Body], max_faces: int) -> list[list[Body]]:
+    """
+    Group bodies close to each other in batches with at most a number of faces,
+    halving them along the axis where their centers spread the most.
+
+    :param bodies: bodies to group
+    :type bodies: list[Body]
+    :param max_faces: largest number of faces of a batch, unless a single body has more
+    :type max_faces: int
+    :return: the groups of bodies
+    :rtype: list[list[Body]]
+    """
+
+    if len(bodies) == 1 or sum(len(body.f_arr) for body in bodies) <= max_faces:
+        return [bodies]
+
+    centers = np.array([body.center for body in bodies])
+    order = np.argsort(centers[:, np.ptp(centers, axis=0).argmax()], kind="stable")
+    half = len(bodies) // 2
+
+    return (split_batches([bodies[i] for i in order[:half]], max_faces) +
+            split_batches([bodies[i] for i in order[half:]], max_faces))
@@ -5,6 +5,7 @@ Module for simplify 3d math.
 from typing import Union
 import math
 import warnings
+import numpy as np
 
 
 class Vec3:
@@ -94,7 +95,7 @@ class Quat:
     :type axis: Vec3
     """
 
-    __slots__ = ["angle", "axis", "w", "x", "y", "z"]
+    __slots__ = ["angle", "axis", "w", "x", "y", "z", "_matrix", "_matrix_coord"]
 
     def __init__(self, angle: float, axis: Vec3 = Vec3(0, 0, 1)) -> None:
         self.axis = axis.normalize()
@@ -103,6 +104,8 @@ class Quat:
         self.x = self.axis.x * math.sin(angle / 2)
         self.y = self.axis.y * math.sin(angle / 2)
         self.z = self.axis.z * math.sin(angle / 2)
+        self._matrix = None
+        self._matrix_coord = None
 
     def __str__(self):
         return f"Quat: (w: {self.w:.4f}, x: {self.x:.4f}, y: {self.y:.4f}, z: {self.z:.4f})"
@@ -164,6 +167,41 @@ class Quat:
 
         return Vec3(self.x, self.y, self.z)
 
+    def matrix(self) -> np.ndarray:
+        """
+        Compute the 3x3 rotation matrix equivalent to :func:`rotate`, so that
+        ``rotate(v, q)`` is ``q.matrix() @ v``.
+        The matrix is cached and computed again only if the coordinates change.
+
+        :return: rotation matrix
+        :rtype: np.ndarray
+        """
+
+        coord = (self.w, self.x, self.y, self.z)
+
+        if self._matrix_coord != coord:
+            w, x, y, z = coord
+            s = 2 / (w * w + x * x + y * y + z * z)
+
+            self._matrix = np.array((
+                (1 - s * (y * y + z * z), s * (x * y + w * z), s * (x * z - w * y)),
+                (s * (x * y - w * z), 1 - s * (x * x + z * z), s * (y * z + w * x)),
+                (s * (x * z + w * y), s * (y * z - w * x), 1 - s * (x * x + y * y))
+            ), dtype=np.float32)
+            self._matrix_coord = coord
+
+        return self._matrix
+
+    def to_mat(self) -> 'Mat':
+        """
+        Convert the :class:`Quat` to the equivalent rotation :class:`Mat`.
+
+        :return: rotation matrix
+        :rtype: Mat
+        """
+
+        return Mat(*(Vec3(*row) for row in self.matrix().tolist()))
+
     def inverse(self) -> 'Quat':
         """
         Compute the inverse of a :class:`Quat`.
@@ -304,3 +342,20 @@ def rotate(vec: Vec3, quat: Quat):
     new_quat = quat.inverse() * vec * quat
 
     return new_quat.to_vec3()
+
+
+def rotate_array(vertices: np.ndarray, quat: Quat) -> np.ndarray:
+    """
+    Performs the rotation of an array of vectors given a rotation quaternion,
+    it is the vectorized version of :func:`rotate`.
+
+    :param vertices: original vectors with shape (N, 3)
+    :type vertices: np.ndarray
+    :param quat: quaternion representing a rotation with a
+        certain angle around a certain axis
+    :type quat: Quat
+    :return: rotated vectors with shape (N, 3)
+    :rtype: np.ndarray
+    """
+
+    return vertices @ quat.matrix().T
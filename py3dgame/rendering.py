@@ -2,124 +2,73 @@
 Module for handling the rendering pipeline.
 """
 
-import math
-from collections import defaultdict
+from typing import Union
 import pygame
 import numpy as np
-from ext_rendering import draw_triangle, fill_bg
-from .math3d import Vec3, Quat, rotate
-from .color import WHITE, darken_color, Color
-from .scene import Scene, Body
+from ext_rendering import draw_triangles, clear, resolve_depth, HIZ_TILE
+from .math3d import Vec3
+from .color import WHITE
+from .camera import Camera
+from .body import Body
+from .instance import Instance
+from .scene import Scene
 
 
-class Camera:
+def depth_order(depth: np.ndarray) -> np.ndarray:
     """
-    Class to handle the camera postion for the rendering.
-
-    :param pos: initial position of the camera, defaults to Vec3(0, 0, 0)
-    :type pos: Vec3, optional
-    :param direction: initial direction of the camera, defaults to Vec3(1, 0, 0)
-    :type direction: Vec3, optional
+    Order of an array of depths from the nearest to the farthest.
+    The depths are quantized to 16 bits, so numpy sorts them with a radix sort
+    in linear time, and equal depths keep their original order.
+
+    :param depth: depths with shape (N,)
+    :type depth: np.ndarray
+    :return: indices that sort the depths
+    :rtype: np.ndarray
     """
 
-    __slots__ = ["pos", "dir", "mouse_pos",
-                 "theta", "zfar", "znear",
-                 "w", "h", "a", "f", "q", "af",
-                 "up", "right", "tup", "tright", "tdir"]
-
-    def __init__(
-            self,
-            pos: Vec3 = Vec3(0, 0, 0),
-            direction: Vec3 = Vec3(1, 0, 0)) -> None:
-
-        self.pos = pos
-        self.dir = direction
-        self.mouse_pos = None
-
-        self.theta = math.pi / 2
-        self.zfar = 1000
-        self.znear = 0.1
-
-        self.w = 0
-        self.h = 0
-        self.a = 0
-        self.f = 0
-        self.q = 0
-        self.af = 0
-
-        self.up = Vec3(0, 0, 0)
-        self.right = Vec3(0, 0, 0)
-        self.tup = 0
-        self.tdir = 0
-        self.tright = 0
-
-    def handle_movements(self, fps: float) -> None:
-        """
-        Move the mare position with A, W, S, D or the arrows and the
-        change the rotation using the mouse.
-        """
-
-        keys = pygame.key.get_pressed()
-        mouse_buttons = pygame.mouse.get_pressed()
-
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.pos = self.pos - self.right / fps
+    if len(depth) < 2:
+        return np.arange(len(depth))
 
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.pos = self.pos + self.right / fps
+    low = depth.min()
+    span = depth.max() - low
+    scale = 65535 / span if span > 0 else 0
+    keys = ((depth - low) * scale).astype(np.uint16)
 
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            self.pos = self.pos + self.dir / fps
+    return np.argsort(keys, kind="stable")
 
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            self.pos = self.pos - self.dir / fps
 
-        if mouse_buttons[1]:
-            if self.mouse_pos is not None:
-                mouse_pos = pygame.mouse.get_pos()
-                mouse_pos = Vec3(mouse_pos[0], mouse_pos[1], 0)
-                angle = (self.mouse_pos - mouse_pos).x / 1000
-                self.dir = rotate(self.dir, Quat(angle, self.up))
-                self.update_view_space()
-
-                angle = (self.mouse_pos - mouse_pos).y / 1000
-                self.dir = rotate(self.dir, Quat(angle, self.right))
-                self.update_view_space()
-
-            mouse_pos = pygame.mouse.get_pos()
-            self.mouse_pos = Vec3(mouse_pos[0], mouse_pos[1], 0)
-        else:
-            self.mouse_pos = None
-
-    def update_projection_space(self, screen: pygame.Surface) -> None:
-        """
-        Update parameters for the computing the screen space.
-
-        :param screen: screen of the active window
-        :type screen: pygame.Surface
-        """
-
-        self.w = screen.get_width()
-        self.h = screen.get_height()
-        self.a = self.h / self.w
-        self.f = 1 / math.tan(self.theta / 2)
-        self.q = self.zfar / (self.zfar - self.znear)
-        self.af = self.a * self.f
-
-    def update_view_space(self) -> None:
-        """
-        Update parameters to compute the view space.
-        """
+class RenderOptions:
+    """
+    Options of a :class:`Renderer` that trade memory or work between
+    frames for speed, they can be changed between frames.
+
+    :param threads: number of threads rasterizing the triangles, defaults to 1
+    :type threads: int, optional
+    :param sort: draw the bodies and their faces from front to back, so that more
+        pixels fail the depth test early, defaults to False
+    :type sort: bool, optional
+    :param reuse: keep the previous image when the camera, the scene and its bodies
+        did not change, see :meth:`Renderer.render`, defaults to False
+    :type reuse: bool, optional
+    :param dirty_rects: when the camera does not move, draw and show only the regions
+        of the screen covered by the bodies that changed, see :meth:`Renderer.draw_dirty`,
+        defaults to False
+    :type dirty_rects: bool, optional
+    """
 
-        up = Vec3(0, 0, 1)
-        self.up = (up - (self.dir * (up * self.dir))).normalize()
-        self.right = self.dir @ self.up
+    __slots__ = ["threads", "sort", "reuse", "dirty_rects"]
 
-        target = self.pos + self.dir
+    def __init__(
+        self,
+        threads: int = 1,
+        sort: bool = False,
+        reuse: bool = False,
+        dirty_rects: bool = False) -> None:
 
-        self.tup = target * self.up
-        self.tdir = target * self.dir
-        self.tright = target * self.right
+        self.threads = threads
+        self.sort = sort
+        self.reuse = reuse
+        self.dirty_rects = dirty_rects
 
 
 class Renderer:
@@ -136,10 +85,17 @@ class Renderer:
     :type clock: pygame.time.Clock
     :param caption: caption of the window, defaults to "Py3dGame"
     :type caption: str, optional
+    :param options: options of the rendering, defaults to the ones of :class:`RenderOptions`
+    :type options: RenderOptions, optional
+
+    When the screen has 24 or 32 bits per pixel the triangles are drawn directly
+    in its pixels, otherwise they are drawn in a buffer copied once on the screen.
     """
 
-    __slots__ = ["screen", "camera", "scene", "clock", "triangles", "computed",
-                 "lib", "buffer", "depth", "buffer_ptr", "depth_ptr"]
+    __slots__ = ["screen", "camera", "scene", "clock", "triangles",
+                 "lib", "buffer", "depth", "buffer_ptr", "depth_ptr", "direct",
+                 "options", "hiz", "hiz_ptr", "state", "overlay",
+                 "drawn", "clip", "stale", "mapped"]
 
     pygame.init()
     font = pygame.font.SysFont('arial', 18, True)
@@ -150,7 +106,9 @@ class Renderer:
         camera: Camera,
         scene: Scene,
         clock: pygame.time.Clock,
-        caption: str = "Py3dGame") -> None:
+        caption: str = "Py3dGame",
+        *,
+        options: RenderOptions = None) -> None:
 
         self.screen = screen
         self.camera = camera
@@ -158,72 +116,469 @@ class Renderer:
         self.screen.fill(self.scene.bgc)
         self.clock = clock
         self.triangles = 0
-        self.computed = defaultdict(self._default_value)
-        self.buffer = pygame.surfarray.array3d(self.screen)
-        self.depth = np.ones((self.buffer.shape[0],
-                              self.buffer.shape[1]),
-                              dtype=np.float32) * self.camera.zfar
-        self.buffer.flags.writeable = True
-        self.depth.flags.writeable = True
-        self.buffer_ptr = self.buffer.__array_interface__['data'][0]
-        self.depth_ptr = self.depth.__array_interface__['data'][0]
+        self.options = RenderOptions() if options is None else options
+        self.state = None
+        self.overlay = []
+        self.drawn = None
+        self.clip = None
+        self.stale = False
+        self.mapped = False
+        self.resize()
 
         pygame.display.set_caption(caption)
 
-    @staticmethod
-    def _default_value() -> None:
-        return None
-
     def render(self) -> None:
         """
         Render all the object in scene.
+        When ``options.reuse`` is set and neither the camera nor the scene changed since
+        the previous frame, the color and depth buffers are kept as they are and
+        only the text is drawn again, see :meth:`frame_state`.
+        The kept image is drawn again after the camera moves or changes its
+        projection, after the background, the light or ``options.sort`` change, after
+        bodies are added, removed or made static and after a body is moved,
+        recolored or switches level of detail. Anything else drawn on the screen
+        between frames stays on it and changes written directly in the arrays
+        of the bodies are not seen, call :meth:`invalidate` after them.
+        When ``options.dirty_rects`` is set and the camera did not change, only the
+        regions covered by the bodies that changed are drawn, see :meth:`draw_dirty`.
         """
 
-        self.triangles = 0
         self.camera.update_projection_space(self.screen)
         self.camera.update_view_space()
-        self.computed = defaultdict(self._default_value)
-        fill_bg(
-            self.buffer_ptr,
-            *self.buffer.strides,
-            *self.scene.bgc, self.camera.w, self.camera.h
+        state = self.frame_state()
+
+        if self.options.reuse and state == self.state:
+            rects = self.clear_overlay()
+        elif self.options.dirty_rects and self.drawn is not None and self.state is not None and \
+                state[0] == self.state[0]:
+            rects = self.clear_overlay() + self.draw_dirty()
+        else:
+            self.overlay = []
+            self.draw_scene()
+            rects = None
+
+        # the levels of detail selected while drawing are part of the state
+        self.state = self.frame_state()
+        text_rects = self.draw_overlay()
+
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects + text_rects)
+
+    def frame_state(self) -> tuple:
+        """
+        Summary of everything the image depends on: the version of the camera,
+        the light, the background color, and the version of the scene and of its bodies.
+        Changes made writing directly in the arrays of the bodies are not tracked,
+        :meth:`invalidate` forces the next frame to be drawn.
+
+        :return: state to compare with the one of the previous frame, its first
+            item changes when the whole image has to be drawn again
+        :rtype: tuple
+        """
+
+        light = self.scene.light
+        view = (self.camera.version, tuple(self.scene.bgc), (light.x, light.y, light.z),
+                self.options.sort)
+
+        return (view, self.scene.version,
+                tuple(body.version for body in (self.scene.bodies or {}).values()))
+
+    def invalidate(self) -> None:
+        """
+        Draw the whole next frame even if nothing changed.
+        """
+
+        self.state = None
+
+    def visible_bodies(self) -> list[Union[Body, Instance]]:
+        """
+        Bodies and batches of static bodies in the view, sorted from front to back
+        if ``options.sort`` is set and with the level of detail matching their size
+        on the screen.
+
+        :return: bodies to draw
+        :rtype: list[Union[Body, Instance]]
+        """
+
+        bodies = [body for body in self.scene.query_frustum(self.camera.frustum, static=False)
+                  if self.camera.is_visible(body)]
+        bodies += [batch for batch in self.scene.static_batches()
+                   if self.camera.is_visible(batch)]
+
+        if self.options.sort and len(bodies) > 1:
+            centers = np.array([body.center for body in bodies])
+            radii = np.array([body.radius for body in bodies])
+            nearest = centers @ self.camera.view[2] - self.camera.view_offset[2] - radii
+            bodies = [bodies[i] for i in depth_order(nearest)]
+
+        for body in bodies:
+            if body.lods:
+                body.select_lod(self.camera.screen_size(body))
+
+        return bodies
+
+    def draw_scene(self) -> None:
+        """
+        Clear the buffers and draw the visible bodies.
+        """
+
+        self.triangles = 0
+        self.map_buffer()
+        self.clear()
+
+        bodies = self.visible_bodies()
+
+        for body in bodies:
+            self.draw_body(body)
+
+        self.unmap_buffer()
+
+        # versions and regions of the bodies drawn, used by draw_dirty
+        self.drawn = {body: (body.version, self.screen_rect(body)) for body in bodies} \
+            if self.options.dirty_rects else None
+
+    def draw_dirty(self) -> list[pygame.Rect]:
+        """
+        Draw again only the regions of the screen covered, in the previous frame
+        or in this one, by the bodies that were added, removed or changed.
+        Each region is cleared and all the bodies overlapping it are drawn with
+        the rasterizer limited to it, the rest of the buffers is kept.
+        When the regions cover more than half of the screen the whole scene is drawn.
+
+        :return: regions drawn
+        :rtype: list[pygame.Rect]
+        """
+
+        bodies = self.visible_bodies()
+        current = {body: (body.version, self.screen_rect(body)) for body in bodies}
+        changed = [rect for body, (version, rect) in self.drawn.items()
+                   if current.get(body, (None,))[0] != version]
+        changed += [rect for body, (version, rect) in current.items()
+                    if self.drawn.get(body, (None,))[0] != version]
+
+        # merge the overlapping regions
+        dirty = []
+
+        for rect in changed:
+            if rect.width == 0 or rect.height == 0:
+                continue
+
+            index = rect.collidelist(dirty)
+
+            while index >= 0:
+                rect = rect.union(dirty.pop(index))
+                index = rect.collidelist(dirty)
+
+            dirty.append(rect)
+
+        if sum(rect.width * rect.height for rect in dirty) * 2 > self.camera.w * self.camera.h:
+            self.draw_scene()
+            return [self.screen.get_rect()]
+
+        self.triangles = 0
+        self.drawn = current
+
+        if not dirty:
+            return []
+
+        self.map_buffer()
+
+        for rect in dirty:
+            self.clear(rect)
+            self.clip = (rect.left, rect.top, rect.right, rect.bottom)
+
+            for body in bodies:
+                if current[body][1].colliderect(rect):
+                    self.draw_body(body)
+
+        self.clip = None
+        self.unmap_buffer(dirty)
+
+        return dirty
+
+    def clear(self, rect: pygame.Rect = None) -> None:
+        """
+        Fill a region of the buffer with the background color and reset its depth.
+        The depth of the tiles of the coarse depth buffer inside the region is
+        written by the rasterizer only when a triangle reaches them,
+        :meth:`get_depth` writes the rest.
+
+        :param rect: region to clear, defaults to the whole screen
+        :type rect: pygame.Rect, optional
+        """
+
+        region = (rect.left, rect.top, rect.right, rect.bottom) if rect else \
+            (0, 0, self.camera.w, self.camera.h)
+
+        clear(
+            self.buffer_ptr, *self.buffer.strides, *self.scene.bgc,
+            self.depth_ptr, *self.depth.strides, self.camera.zfar,
+            self.camera.w, self.camera.h, self.hiz_ptr, *region
         )
-        self.depth.fill(self.camera.zfar)
+        self.stale = True
+
+    def get_depth(self) -> np.ndarray:
+        """
+        Depth buffer with the depth of every pixel written, see :meth:`clear`.
+
+        :return: depth of each pixel with shape (w, h)
+        :rtype: np.ndarray
+        """
+
+        if self.stale:
+            resolve_depth(self.depth_ptr, *self.depth.strides, self.camera.zfar,
+                          self.camera.w, self.camera.h, self.hiz_ptr)
+            self.stale = False
+
+        return self.depth
+
+    def draw_body(self, body: Union[Body, Instance]) -> None:
+        """
+        Draw a body or an instance.
+
+        :param body: body to draw
+        :type body: Union[Body, Instance]
+        """
 
-        for body in self.scene.bodies.values():
+        if isinstance(body, Instance):
+            self.render_instance(body)
+        else:
             self.render_body(body)
 
-        self.screen.blit(pygame.surfarray.make_surface(self.buffer), (0, 0))
+    def screen_rect(self, body: Union[Body, Instance]) -> pygame.Rect:
+        """
+        Region of the screen that may be covered by a body, the projection
+        of its bounding box, or the whole screen if the box crosses the near plane.
+
+        :param body: body to measure
+        :type body: Union[Body, Instance]
+        :return: region of the screen
+        :rtype: pygame.Rect
+        """
+
+        corners = np.array(np.meshgrid(*zip(body.aabb_min, body.aabb_max))).reshape(3, 8).T
+        points = corners.astype(np.float32) @ self.camera.view.T - self.camera.view_offset
+
+        if (points[:, 2] <= self.camera.znear).any():
+            return self.screen.get_rect()
+
+        self.project_view(points)
+        low = np.floor(points[:, :2].min(axis=0)).astype(int) - 1
+        high = np.ceil(points[:, :2].max(axis=0)).astype(int) + 1
+
+        return pygame.Rect(*low, *(high - low)).clip(self.screen.get_rect())
+
+    def clear_overlay(self) -> list[pygame.Rect]:
+        """
+        Put back the pixels under the text drawn by :meth:`draw_overlay`.
+
+        :return: regions of the screen changed
+        :rtype: list[pygame.Rect]
+        """
+
+        for pos, pixels in self.overlay:
+            self.screen.blit(pixels, pos)
+
+        rects = [pygame.Rect(pos, pixels.get_size()) for pos, pixels in self.overlay]
+        self.overlay = []
+
+        return rects
+
+    def draw_overlay(self) -> list[pygame.Rect]:
+        """
+        Draw the frame rate and the number of triangles on the screen.
+        The pixels under the text are saved first, so that :meth:`clear_overlay`
+        can remove it from an image that is kept.
+
+        :return: regions of the screen changed
+        :rtype: list[pygame.Rect]
+        """
 
         fps = self.clock.get_fps()
-        fps_text = self.font.render(f"FPS: {fps:.2f}", True, WHITE)
-        tri_text = self.font.render(f"Triangles: {self.triangles}", True, WHITE)
-        self.screen.blit(fps_text, (10, 10))
-        self.screen.blit(tri_text, (10, 30))
+        texts = ((self.font.render(f"FPS: {fps:.2f}", True, WHITE), (10, 10)),
+                 (self.font.render(f"Triangles: {self.triangles}", True, WHITE), (10, 30)))
+        rects = [text.get_rect(topleft=pos).clip(self.screen.get_rect()) for text, pos in texts]
+        self.overlay = [(rect.topleft, self.screen.subsurface(rect).copy()) for rect in rects]
+
+        for text, pos in texts:
+            self.screen.blit(text, pos)
+
+        return rects
+
+    def map_buffer(self) -> None:
+        """
+        Make ``buffer`` point to the memory where the triangles are drawn,
+        when drawing directly on the screen its pixels are locked until
+        :meth:`unmap_buffer` is called.
+        """
+
+        if self.direct:
+            self.buffer = pygame.surfarray.pixels3d(self.screen)
+            self.buffer_ptr = self.buffer.__array_interface__['data'][0]
+
+        self.mapped = True
+
+    def unmap_buffer(self, rects: list[pygame.Rect] = None) -> None:
+        """
+        Make the drawn triangles visible on the screen, releasing its pixels
+        or copying the buffer on it.
+
+        :param rects: regions of the buffer to copy, defaults to the whole buffer
+        :type rects: list[pygame.Rect], optional
+        """
 
-        pygame.display.flip()
+        if self.direct:
+            self.buffer = None
+            self.buffer_ptr = 0
+        elif rects is None:
+            pygame.surfarray.blit_array(self.screen, self.buffer)
+        else:
+            for rect in rects:
+                pygame.surfarray.blit_array(self.screen.subsurface(rect),
+                                            self.buffer[rect.left:rect.right, rect.top:rect.bottom])
 
+        self.mapped = False
 
     def render_body(self, body: Body):
         """
         Render a specific body.
+        All the vertices of the body are projected at once and the faces
+        that are back facing or outside the view are discarded before
+        drawing the remaining ones, the faces crossing the near plane
+        are clipped with :meth:`clip_near`.
+        Outside :meth:`render` the buffer is mapped just for the body.
 
         :param body: body to render
         :type body: Body
         """
 
-        for i, normal in enumerate(body.n):
-            face = body.f[i]
-            cam_to_vertex = body.v[face[0]] - self.camera.pos
+        if len(body.f_arr) == 0:
+            return
+
+        if not self.mapped:
+            self.map_buffer()
+            self.render_body(body)
+            self.unmap_buffer()
+            return
+
+        points = self.project_body(body)
+        cam_pos = np.array((self.camera.pos.x, self.camera.pos.y, self.camera.pos.z),
+                           dtype=np.float32)
+
+        cam_to_vertex = body.v_arr[body.f_arr[:, 0]] - cam_pos
+        front = np.einsum("ij,ij->i", cam_to_vertex, body.n_arr) > 0
+
+        light = np.array((self.scene.light.x, self.scene.light.y, self.scene.light.z),
+                         dtype=np.float32)
+
+        self.draw_mesh(body, points, front, body.n_arr @ light, body.c_arr)
+
+    def render_instance(self, instance: Instance) -> None:
+        """
+        Render an instance of a shared mesh, like :meth:`render_body`.
+        The shared vertices go to view space with a single matrix combining the
+        transformation of the instance and the camera, while the back facing
+        test and the light use the camera and the light moved in the reference
+        system of the mesh, so no array of the mesh is transformed to world coordinates.
+
+        :param instance: instance to render
+        :type instance: Instance
+        """
+
+        if len(instance.f_arr) == 0:
+            return
+
+        if not self.mapped:
+            self.map_buffer()
+            self.render_instance(instance)
+            self.unmap_buffer()
+            return
+
+        points = instance.vertices_arr @ (self.camera.view @ instance.matrix).T
+        points += self.camera.view @ instance.offset - self.camera.view_offset
+        self.project_view(points)
 
-            if cam_to_vertex * normal > 0:
+        cam_pos = np.array((self.camera.pos.x, self.camera.pos.y, self.camera.pos.z),
+                           dtype=np.float32)
+        cam_pos = instance.matrix.T @ (cam_pos - instance.offset)
 
-                if body.single_color:
-                    color = body.color
-                else:
-                    color = body.color[i]
+        cam_to_vertex = instance.vertices_arr[instance.f_arr[:, 0]] - cam_pos
+        front = np.einsum("ij,ij->i", cam_to_vertex, instance.normals_arr) > 0
 
-                self.render_face(body, face, normal, color)
+        light = np.array((self.scene.light.x, self.scene.light.y, self.scene.light.z),
+                         dtype=np.float32)
+        colors = instance.c_arr if instance.color is None else \
+            np.array(instance.color, dtype=np.float32)
+
+        self.draw_mesh(instance, points, front, instance.normals_arr @ (instance.matrix.T @ light),
+                       colors)
+
+    def draw_mesh(self,
+        body: Union[Body, Instance],
+        points: np.ndarray,
+        front: np.ndarray,
+        light: np.ndarray,
+        colors: np.ndarray) -> None:
+        """
+        Draw the faces of a projected mesh that are front facing and in the view,
+        the faces crossing the near plane are clipped with :meth:`clip_near`.
+
+        :param body: body or instance the mesh belongs to
+        :type body: Body, Instance
+        :param points: vertices of the mesh in screen space with shape (N, 3)
+        :type points: np.ndarray
+        :param front: boolean mask of the front facing faces with shape (F,)
+        :type front: np.ndarray
+        :param light: cosine between the normal of each face and the light with shape (F,)
+        :type light: np.ndarray
+        :param colors: color of each face with shape (F, 3) or a single color with shape (3,)
+        :type colors: np.ndarray
+        """
+
+        faces = body.f_arr
+        triangles = points[faces]
+        z = triangles[:, :, 2]
+
+        # pixels beyond the far plane fail the depth test against the cleared buffer
+        visible = front & ~(z > self.camera.zfar).all(axis=1)
+        behind = z < self.camera.znear
+        crossing = visible & behind.any(axis=1) & ~behind.all(axis=1)
+
+        visible &= ~behind.any(axis=1) & self.on_screen(triangles)
+        visible = np.flatnonzero(visible)
+        faces = faces[visible]
+
+        if crossing.any():
+            crossing = np.flatnonzero(crossing)
+            crossing_faces = body.f_arr[crossing]
+
+            # an instance transforms only the vertices of the faces to clip
+            if isinstance(body, Instance):
+                corners = body.vertices_arr[crossing_faces] @ body.matrix.T + body.offset
+            else:
+                corners = body.v_arr[crossing_faces]
+
+            new, clipped, source = self.clip_near(corners, points, crossing_faces)
+            points = np.concatenate((points, new))
+            inside = self.on_screen(points[clipped])
+            faces = np.concatenate((faces, clipped[inside]))
+            visible = np.concatenate((visible, crossing[source[inside]]))
+
+        if self.options.sort:
+            order = depth_order(points[faces, 2].min(axis=1))
+            faces = faces[order]
+            visible = visible[order]
+
+        light_intensity = light[visible] / 2 + 0.5
+
+        if colors.ndim == 2:
+            colors = colors[visible]
+
+        colors = colors * light_intensity[:, np.newaxis]
+
+        self.render_faces(points, faces, colors.astype(np.uint8))
 
     def to_view_space(self, point: Vec3) -> Vec3:
         """
@@ -264,86 +619,176 @@ class Renderer:
 
         return (x, y, z)
 
-    def render_face(self,
-        body: Body,
-        face: tuple[int, int, int],
-        normal: Vec3,
-        color: Color) -> None:
+    def project_vertices(self, vertices: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Convert an array of points from world coordinates to screen space,
+        it is the vectorized version of :meth:`to_view_space` followed by
+        :meth:`project_point`.
+
+        :param vertices: points in world coordinates with shape (N, 3)
+        :type vertices: np.ndarray
+        :param out: float32 array with shape (N, 3) where the result is stored,
+            defaults to None
+        :type out: np.ndarray, optional
+        :return: points in screen space with shape (N, 3)
+        :rtype: np.ndarray
         """
-        Render a specific face.
 
-        :param body: body that contain the face
-        :type body: Body
-        :param face: face to render
-        :type face: tuple[int, int, int]
-        :param normal: normal of the face
-        :type normal: Vec3
-        :param color: RGB color of the face
-        :type color: Color
-        """
-
-        if (point1 := self.computed[face[0]]) is None:
-            point1 = self.to_view_space(body.v[face[0]])
-            point1 = self.project_point(point1)
-            self.computed[face[0]] = point1
-
-        if (point2 := self.computed[face[1]]) is None:
-            point2 = self.to_view_space(body.v[face[1]])
-            point2 = self.project_point(point2)
-            self.computed[face[1]] = point2
-
-        if (point3 := self.computed[face[2]]) is None:
-            point3 = self.to_view_space(body.v[face[2]])
-            point3 = self.project_point(point3)
-            self.computed[face[2]] = point3
-
-        p1x, p1y, p1z = point1
-        p2x, p2y, p2z = point2
-        p3x, p3y, p3z = point3
-
-        if (p1x > self.camera.w and
-            p2x > self.camera.w and
-            p3x > self.camera.w):
-            return
+        points = np.matmul(vertices, self.camera.view.T, out=out)
+        points -= self.camera.view_offset
 
-        if (p1x < 0 and
-            p2x < 0 and
-            p3x < 0):
-            return
+        return self.project_view(points)
 
-        if (p1y > self.camera.h and
-            p2y > self.camera.h and
-            p3y > self.camera.h):
-            return
+    def project_view(self, points: np.ndarray) -> np.ndarray:
+        """
+        Project in place an array of points from view space to screen space,
+        it is the vectorized version of :meth:`project_point`.
 
-        if (p1y < 0 and
-            p2y < 0 and
-            p3y < 0):
-            return
+        :param points: float32 points in view space with shape (N, 3)
+        :type points: np.ndarray
+        :return: the same array with the points in screen space
+        :rtype: np.ndarray
+        """
 
-        if (p1z < self.camera.znear or
-            p2z < self.camera.znear or
-            p3z < self.camera.znear):
-            return
+        depth = points[:, 2]
+        div = np.where(depth != 0, depth, 1)
 
-        if (p1z > self.camera.zfar or
-            p2z > self.camera.zfar or
-            p3z > self.camera.zfar):
-            return
+        points[:, 0] *= self.camera.af
+        points[:, 1] *= - self.camera.f
+        points[:, :2] /= div[:, np.newaxis]
+        points[:, :2] += 1
+        points[:, 0] *= self.camera.w / 2
+        points[:, 1] *= self.camera.h / 2
+        depth -= self.camera.znear
+        depth *= self.camera.q
+
+        return points
+
+    def on_screen(self, triangles: np.ndarray) -> np.ndarray:
+        """
+        Check which triangles may cover some pixels of the screen,
+        a triangle is discarded only if all its vertices are beyond the same side.
+
+        :param triangles: vertices of the triangles in screen space with shape (K, 3, 3)
+        :type triangles: np.ndarray
+        :return: boolean mask with shape (K,)
+        :rtype: np.ndarray
+        """
 
-        light_intensity = (normal * self.scene.light) / 2 + 0.5
+        x = triangles[:, :, 0]
+        y = triangles[:, :, 1]
+
+        return ~((x > self.camera.w).all(axis=1) |
+                 (x < 0).all(axis=1) |
+                 (y > self.camera.h).all(axis=1) |
+                 (y < 0).all(axis=1))
+
+    def clip_near(self,
+        corners: np.ndarray,
+        points: np.ndarray,
+        faces: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Clip against the near plane faces that are partially behind it.
+        A face with one vertex in front of the plane becomes a smaller triangle,
+        a face with two vertices in front becomes a quad split in two triangles,
+        the winding of the faces is preserved.
+
+        :param corners: vertices of the faces in world coordinates with shape (K, 3, 3)
+        :type corners: np.ndarray
+        :param points: vertices in screen space with shape (N, 3)
+        :type points: np.ndarray
+        :param faces: faces crossing the near plane with shape (K, 3)
+        :type faces: np.ndarray
+        :return: the new vertices in screen space with shape (2K, 3), stored after
+            ``points``, the clipped faces indexing both arrays and for each of them
+            the index of the face it comes from
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+
+        n_faces = len(faces)
+        behind = points[faces, 2] < self.camera.znear
+        single_front = behind.sum(axis=1) == 2
+
+        # roll the faces so the vertex alone on its side of the plane comes first
+        alone = np.argmax(behind != single_front[:, np.newaxis], axis=1)
+        rows = np.arange(n_faces)[:, np.newaxis]
+        order = (alone[:, np.newaxis] + (0, 1, 2)) % 3
+        rolled = faces[rows, order]
+
+        depth = points[rolled, 2]
+        t = (self.camera.znear - depth[:, :1]) / (depth[:, 1:] - depth[:, :1])
+
+        view = corners[rows, order] @ self.camera.view.T - self.camera.view_offset
+        new = view[:, :1] + t[:, :, np.newaxis] * (view[:, 1:] - view[:, :1])
+        new = np.ascontiguousarray(new.transpose(1, 0, 2).reshape(-1, 3), dtype=np.float32)
+        self.project_view(new)
+
+        first = np.arange(n_faces) + len(points)
+        second = first + n_faces
+        double_front = ~single_front
+
+        clipped = np.concatenate((
+            np.stack((rolled[single_front, 0], first[single_front], second[single_front]), axis=1),
+            np.stack((first[double_front], rolled[double_front, 1], rolled[double_front, 2]),
+                     axis=1),
+            np.stack((first[double_front], rolled[double_front, 2], second[double_front]), axis=1)
+        ))
+        source = np.concatenate((np.flatnonzero(single_front),
+                                 np.flatnonzero(double_front),
+                                 np.flatnonzero(double_front)))
+
+        return new, clipped, source
+
+    def project_body(self, body: Body) -> np.ndarray:
+        """
+        Project the vertices of a body in screen space.
+        The result is stored in a buffer owned by the body, so it is indexed by
+        the vertex id without mixing bodies, and it is stamped with the versions of
+        the camera and of the body so that it is reused until one of them changes.
 
-        draw_triangle(
+        :param body: body to project
+        :type body: Body
+        :return: vertices of the body in screen space with shape (N, 3)
+        :rtype: np.ndarray
+        """
+
+        stamp = (self.camera.version, body.version)
+
+        if body.proj_stamp != stamp:
+            self.project_vertices(body.v_arr, body.proj)
+            body.proj_stamp = stamp
+
+        return body.proj
+
+    def render_faces(self,
+        points: np.ndarray,
+        faces: np.ndarray,
+        colors: np.ndarray) -> None:
+        """
+        Render a batch of faces with a single call to the rasterizer.
+
+        :param points: vertices in screen space with shape (N, 3)
+        :type points: np.ndarray
+        :param faces: indexes of the vertices of each face with shape (K, 3)
+        :type faces: np.ndarray
+        :param colors: RGB color of each face, already shaded, with shape (K, 3)
+        :type colors: np.ndarray
+        """
+
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        faces = np.ascontiguousarray(faces, dtype=np.int32)
+        colors = np.ascontiguousarray(colors, dtype=np.uint8)
+
+        draw_triangles(
             self.buffer_ptr, *self.buffer.strides,
             self.depth_ptr, *self.depth.strides,
-            p1x, p1y, p1z,
-            p2x, p2y, p2z,
-            p3x, p3y, p3z,
-            *darken_color(color, light_intensity),
-            self.camera.w, self.camera.h
+            points.ctypes.data, len(points),
+            faces.ctypes.data, colors.ctypes.data, len(faces),
+            self.camera.w, self.camera.h, self.options.threads, self.hiz_ptr,
+            *(self.clip or (0, 0, self.camera.w, self.camera.h)), self.camera.zfar
         )
 
-        self.triangles += 1
+        self.triangles += len(faces)
 
     def resize(self) -> None:
         """
@@ -351,11 +796,24 @@ class Renderer:
         Should always be used after when the event ``pygame.VIDEORESIZE`` occurs.
         """
 
-        self.buffer = pygame.surfarray.array3d(self.screen)
-        self.depth = np.ones((self.buffer.shape[0],
-                              self.buffer.shape[1]),
-                              dtype=np.float32) * self.camera.zfar
-        self.buffer.flags.writeable = True
-        self.depth.flags.writeable = True
-        self.buffer_ptr = self.buffer.__array_interface__['data'][0]
+        w, h = self.screen.get_size()
+        # depth is stored row by row like the pixels of the screen
+        self.depth = np.full((h, w), self.camera.zfar, dtype=np.float32).T
         self.depth_ptr = self.depth.__array_interface__['data'][0]
+        # upper bound of the depth of each tile of HIZ_TILE x HIZ_TILE pixels
+        self.hiz = np.full((- (- h // HIZ_TILE), - (- w // HIZ_TILE)), self.camera.zfar,
+                           dtype=np.float32)
+        self.hiz_ptr = self.hiz.__array_interface__['data'][0]
+        self.direct = self.screen.get_bitsize() in (24, 32)
+        self.state = None
+        self.overlay = []
+        self.drawn = None
+        self.stale = False
+        self.mapped = False
+
+        if self.direct:
+            self.buffer = None
+            self.buffer_ptr = 0
+        else:
+            self.buffer = np.zeros((w, h, 3), dtype=np.uint8)
+            self.buffer_ptr = self.buffer.__array_interface__['data'][0]
@@ -0,0 +1,254 @@
+"""
+Mesh simplification by edge collapse with quadric error metrics.
+"""
+
+import heapq
+import math
+import numpy as np
+
+
+# weight of the planes keeping the open borders of a mesh in place
+BOUNDARY_WEIGHT = 100
+
+
+def weld(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge the vertices with the same position and remove the faces left degenerate.
+
+    :param vertices: vertices with shape (N, 3)
+    :type vertices: np.ndarray
+    :param faces: indexes of the vertices of each face with shape (F, 3)
+    :type faces: np.ndarray
+    :return: the unique vertices, the faces indexing them and the indexes
+        of the faces that were kept
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+
+    unique, inverse = np.unique(vertices, axis=0, return_inverse=True)
+    faces = inverse.reshape(-1)[faces]
+    kept = np.flatnonzero((faces[:, 0] != faces[:, 1]) &
+                          (faces[:, 1] != faces[:, 2]) &
+                          (faces[:, 2] != faces[:, 0]))
+
+    return unique, faces[kept], kept
+
+
+def _quadrics(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # the quadrics of the faces are weighted by their area, the weights of the
+    # vertices turn the error of a collapse in a mean squared distance
+    p1, p2, p3 = vertices[faces].transpose(1, 0, 2)
+    normals = np.cross(p2 - p1, p3 - p1)
+    areas = np.linalg.norm(normals, axis=1)
+    normals /= np.where(areas > 0, areas, 1)[:, np.newaxis]
+
+    planes = np.column_stack((normals, - np.einsum("ij,ij->i", normals, p1)))
+    face_quadrics = areas[:, np.newaxis, np.newaxis] * planes[:, :, np.newaxis] * \
+        planes[:, np.newaxis, :]
+
+    quadrics = np.zeros((len(vertices), 4, 4))
+    vertex_weights = np.zeros(len(vertices))
+    for k in range(3):
+        np.add.at(quadrics, faces[:, k], face_quadrics)
+        np.add.at(vertex_weights, faces[:, k], areas)
+
+    # planes through the edges used by a single face, perpendicular to it
+    edges = np.concatenate((faces[:, (0, 1)], faces[:, (1, 2)], faces[:, (2, 0)]))
+    owners = np.tile(np.arange(len(faces)), 3)
+    _, index, counts = np.unique(np.sort(edges, axis=1), axis=0,
+                                 return_index=True, return_counts=True)
+    boundary = index[counts == 1]
+
+    if len(boundary) > 0:
+        a = vertices[edges[boundary, 0]]
+        b = vertices[edges[boundary, 1]]
+        side = np.cross(b - a, normals[owners[boundary]])
+        lengths = np.linalg.norm(side, axis=1)
+        side /= np.where(lengths > 0, lengths, 1)[:, np.newaxis]
+
+        planes = np.column_stack((side, - np.einsum("ij,ij->i", side, a)))
+        weights = BOUNDARY_WEIGHT * np.einsum("ij,ij->i", b - a, b - a)
+        edge_quadrics = weights[:, np.newaxis, np.newaxis] * planes[:, :, np.newaxis] * \
+            planes[:, np.newaxis, :]
+
+        np.add.at(quadrics, edges[boundary, 0], edge_quadrics)
+        np.add.at(quadrics, edges[boundary, 1], edge_quadrics)
+
+    return quadrics, vertex_weights
+
+
+def _collapse_targets(
+    quadrics: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # the best of the ends, the middle point and, when it exists, the minimum of the quadric
+    matrices = quadrics[:, :3, :3]
+    solvable = np.abs(np.linalg.det(matrices)) > 1e-12
+    matrices = np.where(solvable[:, np.newaxis, np.newaxis], matrices, np.eye(3))
+    optimal = np.linalg.solve(matrices, - quadrics[:, :3, 3:])[:, :, 0]
+    optimal[~solvable] = a[~solvable]
+
+    candidates = np.stack((a, b, (a + b) / 2, optimal), axis=1)
+    errors = (np.einsum("kci,kij,kcj->kc", candidates, quadrics[:, :3, :3], candidates) +
+              2 * np.einsum("kci,ki->kc", candidates, quadrics[:, :3, 3]) +
+              quadrics[:, 3:, 3])
+    best = np.argmin(errors, axis=1)
+    rows = np.arange(len(best))
+
+    return np.maximum(errors[rows, best], 0), candidates[rows, best]
+
+
+class _Mesh:
+    """
+    Mesh being simplified, with the faces around each vertex.
+    """
+
+    __slots__ = ["positions", "quadrics", "weights", "faces", "face_alive", "vertex_faces",
+                 "versions", "heap", "n_faces"]
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray) -> None:
+        self.positions = vertices.astype(np.float64)
+        self.quadrics, self.weights = _quadrics(self.positions, faces)
+        self.faces = faces.tolist()
+        self.face_alive = [True] * len(self.faces)
+        self.vertex_faces = [set() for _ in range(len(vertices))]
+        self.versions = [0] * len(vertices)
+        self.heap = []
+        self.n_faces = len(self.faces)
+
+        for i, face in enumerate(self.faces):
+            for vertex in face:
+                self.vertex_faces[vertex].add(i)
+
+        self.push(sorted({(min(a, b), max(a, b))
+                          for face in self.faces for a, b in zip(face, face[1:] + face[:1])}))
+
+    def neighbors(self, vertex: int) -> set:
+        """
+        Vertices sharing a face with a vertex.
+        """
+
+        return {other for face in self.vertex_faces[vertex]
+                for other in self.faces[face] if other != vertex}
+
+    def push(self, edges: list) -> None:
+        """
+        Compute the cost of collapsing some edges, the mean squared distance
+        of the target from the planes around them, and store them in the heap.
+        """
+
+        if not edges:
+            return
+
+        a, b = np.array(edges).T
+        errors, targets = _collapse_targets(self.quadrics[a] + self.quadrics[b],
+                                            self.positions[a], self.positions[b])
+        weights = self.weights[a] + self.weights[b]
+        errors /= np.where(weights > 0, weights, 1)
+
+        for error, i, j, target in zip(errors.tolist(), a.tolist(), b.tolist(), targets):
+            heapq.heappush(self.heap, (error, i, j, self.versions[i], self.versions[j], target))
+
+    def can_collapse(self, a: int, b: int, target: np.ndarray) -> bool:
+        """
+        Check that moving a and b to target keeps the mesh manifold and
+        does not flip any of the faces around them.
+        """
+
+        shared = self.vertex_faces[a] & self.vertex_faces[b]
+
+        if len(self.neighbors(a) & self.neighbors(b)) != len(shared):
+            return False
+
+        moved = [(face, self.faces[face].index(vertex)) for vertex in (a, b)
+                 for face in self.vertex_faces[vertex] - shared]
+
+        if not moved:
+            return True
+
+        before = self.positions[[self.faces[face] for face, _ in moved]]
+        after = before.copy()
+        after[np.arange(len(moved)), [corner for _, corner in moved]] = target
+
+        normals_before = np.cross(before[:, 1] - before[:, 0], before[:, 2] - before[:, 0])
+        normals_after = np.cross(after[:, 1] - after[:, 0], after[:, 2] - after[:, 0])
+
+        return bool((np.einsum("ij,ij->i", normals_before, normals_after) > 0).all())
+
+    def collapse(self, a: int, b: int, target: np.ndarray) -> None:
+        """
+        Merge b into a, placing a in target.
+        """
+
+        self.positions[a] = target
+        self.quadrics[a] += self.quadrics[b]
+        self.weights[a] += self.weights[b]
+
+        for face in self.vertex_faces[b]:
+            if a in self.faces[face]:
+                self.face_alive[face] = False
+                self.n_faces -= 1
+
+                for vertex in self.faces[face]:
+                    if vertex != b:
+                        self.vertex_faces[vertex].discard(face)
+            else:
+                self.faces[face][self.faces[face].index(b)] = a
+                self.vertex_faces[a].add(face)
+
+        self.vertex_faces[b] = set()
+        self.versions[a] += 1
+        self.versions[b] += 1
+
+        self.push([(min(a, other), max(a, other)) for other in self.neighbors(a)])
+
+
+def simplify(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    target_faces: int = 0,
+    max_error: float = math.inf) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce the number of faces of a mesh collapsing its edges, starting from the
+    collapses that move the surface the least according to the quadric error metric.
+    The vertices with the same position are merged before simplifying.
+
+    :param vertices: vertices with shape (N, 3)
+    :type vertices: np.ndarray
+    :param faces: indexes of the vertices of each face with shape (F, 3)
+    :type faces: np.ndarray
+    :param target_faces: number of faces where to stop, defaults to 0
+    :type target_faces: int, optional
+    :param max_error: largest distance from the original surface allowed for a
+        collapse, as the root mean square distance from the planes of the
+        original faces around it weighted by their area, defaults to math.inf
+    :type max_error: float, optional
+    :return: the vertices and the faces of the simplified mesh, and for each face
+        the index of the original face it comes from
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+
+    vertices, faces, source = weld(np.asarray(vertices, dtype=np.float32).reshape(-1, 3),
+                                   np.asarray(faces, dtype=np.int64).reshape(-1, 3))
+    mesh = _Mesh(vertices, faces)
+    max_cost = max_error * max_error if math.isfinite(max_error) else math.inf
+
+    while mesh.n_faces > target_faces and mesh.heap:
+        error, a, b, version_a, version_b, target = heapq.heappop(mesh.heap)
+
+        if error > max_cost:
+            break
+
+        if (version_a != mesh.versions[a] or version_b != mesh.versions[b] or
+                not mesh.vertex_faces[a] or not mesh.vertex_faces[b]):
+            continue
+
+        if mesh.can_collapse(a, b, target):
+            mesh.collapse(a, b, target)
+
+    alive = np.flatnonzero(mesh.face_alive)
+    faces = np.array(mesh.faces, dtype=np.int64).reshape(-1, 3)[alive]
+    used, faces = np.unique(faces, return_inverse=True)
+
+    return (mesh.positions[used].astype(np.float32),
+            faces.reshape(-1, 3).astype(np.int32),
+            source[alive])
@@ -0,0 +1,391 @@
+"""
+Spatial acceleration structures to query the bodies of a scene.
+"""
+
+import math
+import numpy as np
+
+
+class _Node:
+    """
+    Node of the :class:`BVH`, leaves store a body while internal nodes
+    store the box enclosing their two children.
+    """
+
+    __slots__ = ["parent", "left", "right", "low", "high", "body"]
+
+    def __init__(self, low: tuple, high: tuple, body=None) -> None:
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.low = low
+        self.high = high
+        self.body = body
+
+
+def _union(low1: tuple, high1: tuple, low2: tuple, high2: tuple) -> tuple[tuple, tuple]:
+    return ((min(low1[0], low2[0]), min(low1[1], low2[1]), min(low1[2], low2[2])),
+            (max(high1[0], high2[0]), max(high1[1], high2[1]), max(high1[2], high2[2])))
+
+
+def _area(low: tuple, high: tuple) -> float:
+    dx = high[0] - low[0]
+    dy = high[1] - low[1]
+    dz = high[2] - low[2]
+
+    return dx * dy + dy * dz + dz * dx
+
+
+def _contains(low1: tuple, high1: tuple, low2: tuple, high2: tuple) -> bool:
+    return (low1[0] <= low2[0] and low1[1] <= low2[1] and low1[2] <= low2[2] and
+            high1[0] >= high2[0] and high1[1] >= high2[1] and high1[2] >= high2[2])
+
+
+def _body_box(body) -> tuple[tuple, tuple]:
+    return tuple(body.aabb_min.tolist()), tuple(body.aabb_max.tolist())
+
+
+def sphere_box(center: tuple, radius: float, low: tuple, high: tuple) -> bool:
+    """
+    Check if a sphere intersects an axis aligned box.
+
+    :param center: center of the sphere
+    :type center: tuple[float, float, float]
+    :param radius: radius of the sphere
+    :type radius: float
+    :param low: minimum corner of the box
+    :type low: tuple[float, float, float]
+    :param high: maximum corner of the box
+    :type high: tuple[float, float, float]
+    :return: True if they intersect
+    :rtype: bool
+    """
+
+    distance2 = 0
+
+    for c, l, h in zip(center, low, high):
+        if c < l:
+            distance2 += (l - c) * (l - c)
+        elif c > h:
+            distance2 += (c - h) * (c - h)
+
+    return distance2 <= radius * radius
+
+
+def ray_box(
+    origin: tuple,
+    direction: tuple,
+    low: tuple,
+    high: tuple,
+    max_distance: float = math.inf) -> float:
+    """
+    Compute where a ray enters an axis aligned box.
+
+    :param origin: origin of the ray
+    :type origin: tuple[float, float, float]
+    :param direction: direction of the ray
+    :type direction: tuple[float, float, float]
+    :param low: minimum corner of the box
+    :type low: tuple[float, float, float]
+    :param high: maximum corner of the box
+    :type high: tuple[float, float, float]
+    :param max_distance: length of the ray, defaults to math.inf
+    :type max_distance: float, optional
+    :return: distance of the hit in multiples of the direction, None if it misses
+    :rtype: float
+    """
+
+    t_min = 0
+    t_max = max_distance
+
+    for o, d, l, h in zip(origin, direction, low, high):
+        if d == 0:
+            if o < l or o > h:
+                return None
+        else:
+            t1 = (l - o) / d
+            t2 = (h - o) / d
+            t_min = max(t_min, min(t1, t2))
+            t_max = min(t_max, max(t1, t2))
+
+            if t_min > t_max:
+                return None
+
+    return t_min
+
+
+class BVH:
+    """
+    Dynamic bounding volume hierarchy of the axis aligned boxes of the bodies.
+    The leaves store boxes enlarged by a margin, so a body that moves a little
+    does not need to be moved inside the tree.
+
+    :param margin: enlargement of the leaves as a fraction of the body size, defaults to 0.1
+    :type margin: float, optional
+    """
+
+    __slots__ = ["root", "leaves", "margin"]
+
+    def __init__(self, margin: float = 0.1) -> None:
+        self.root = None
+        self.leaves = {}
+        self.margin = margin
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def __contains__(self, body) -> bool:
+        return id(body) in self.leaves
+
+    def insert(self, body) -> None:
+        """
+        Insert a body in the tree, it should be removed before inserting it again.
+
+        :param body: body to insert
+        :type body: Body
+        """
+
+        low, high = _body_box(body)
+        margin = [(h - l) * self.margin + 1e-3 for l, h in zip(low, high)]
+        leaf = _Node(tuple(l - m for l, m in zip(low, margin)),
+                     tuple(h + m for h, m in zip(high, margin)),
+                     body)
+        self.leaves[id(body)] = leaf
+
+        if self.root is None:
+            self.root = leaf
+            return
+
+        sibling = self._find_sibling(leaf)
+        parent = _Node(*_union(sibling.low, sibling.high, leaf.low, leaf.high))
+        parent.parent = sibling.parent
+        parent.left = sibling
+        parent.right = leaf
+
+        if sibling.parent is None:
+            self.root = parent
+        elif sibling.parent.left is sibling:
+            sibling.parent.left = parent
+        else:
+            sibling.parent.right = parent
+
+        sibling.parent = parent
+        leaf.parent = parent
+        self._refit(parent.parent)
+
+    def remove(self, body) -> None:
+        """
+        Remove a body from the tree.
+
+        :param body: body to remove
+        :type body: Body
+        """
+
+        leaf = self.leaves.pop(id(body))
+        parent = leaf.parent
+
+        if parent is None:
+            self.root = None
+            return
+
+        sibling = parent.left if parent.right is leaf else parent.right
+        sibling.parent = parent.parent
+
+        if parent.parent is None:
+            self.root = sibling
+        else:
+            if parent.parent.left is parent:
+                parent.parent.left = sibling
+            else:
+                parent.parent.right = sibling
+
+            self._refit(parent.parent)
+
+    def update(self, body) -> None:
+        """
+        Update the position of a body in the tree after it has moved,
+        the tree changes only if the body left its enlarged box.
+
+        :param body: body that has moved
+        :type body: Body
+        """
+
+        leaf = self.leaves[id(body)]
+
+        if not _contains(leaf.low, leaf.high, *_body_box(body)):
+            self.remove(body)
+            self.insert(body)
+
+    def _find_sibling(self, leaf: _Node) -> _Node:
+        node = self.root
+
+        while node.body is None:
+            area = _area(node.low, node.high)
+            combined = _area(*_union(node.low, node.high, leaf.low, leaf.high))
+            # cost of creating a new parent here and cost pushed down to the children
+            cost = 2 * combined
+            inheritance = 2 * (combined - area)
+
+            child_costs = []
+            for child in (node.left, node.right):
+                child_area = _area(*_union(child.low, child.high, leaf.low, leaf.high))
+
+                if child.body is None:
+                    child_area -= _area(child.low, child.high)
+
+                child_costs.append(child_area + inheritance)
+
+            if cost < child_costs[0] and cost < child_costs[1]:
+                break
+
+            node = node.left if child_costs[0] <= child_costs[1] else node.right
+
+        return node
+
+    def _refit(self, node: _Node) -> None:
+        while node is not None:
+            node.low, node.high = _union(node.left.low, node.left.high,
+                                         node.right.low, node.right.high)
+            node = node.parent
+
+    def _collect(self, node: _Node, result: list) -> None:
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node.body is not None:
+                result.append(node.body)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+    def query_frustum(self, planes: np.ndarray) -> list:
+        """
+        Find the bodies whose box intersects a convex volume such as the view frustum.
+
+        :param planes: planes ``(a, b, c, d)`` with shape (K, 4), a point ``p`` is inside
+            the volume when ``a * p.x + b * p.y + c * p.z + d >= 0`` for every plane
+        :type planes: np.ndarray
+        :return: bodies that may be inside the volume
+        :rtype: list[Body]
+        """
+
+        result = []
+
+        if self.root is None:
+            return result
+
+        planes = [tuple(plane) for plane in np.asarray(planes).tolist()]
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+
+            if node.body is not None:
+                low, high = _body_box(node.body)
+            else:
+                low, high = node.low, node.high
+
+            inside = True
+
+            for a, b, c, d in planes:
+                far = (a * (high[0] if a > 0 else low[0]) +
+                       b * (high[1] if b > 0 else low[1]) +
+                       c * (high[2] if c > 0 else low[2]) + d)
+
+                if far < 0:
+                    break
+
+                near = (a * (low[0] if a > 0 else high[0]) +
+                        b * (low[1] if b > 0 else high[1]) +
+                        c * (low[2] if c > 0 else high[2]) + d)
+                inside = inside and near >= 0
+            else:
+                if inside or node.body is not None:
+                    self._collect(node, result)
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+
+        return result
+
+    def query_radius(self, center: tuple[float, float, float], radius: float) -> list:
+        """
+        Find the bodies whose bounds intersect a sphere.
+
+        :param center: center of the sphere
+        :type center: tuple[float, float, float]
+        :param radius: radius of the sphere
+        :type radius: float
+        :return: bodies that intersect the sphere
+        :rtype: list[Body]
+        """
+
+        result = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node.body is not None:
+                low, high = _body_box(node.body)
+            else:
+                low, high = node.low, node.high
+
+            if not sphere_box(center, radius, low, high):
+                continue
+
+            if node.body is None:
+                stack.append(node.right)
+                stack.append(node.left)
+            elif (math.dist(center, node.body.center.tolist()) <=
+                  radius + node.body.radius):
+                result.append(node.body)
+
+        return result
+
+    def query_ray(
+        self,
+        origin: tuple[float, float, float],
+        direction: tuple[float, float, float],
+        max_distance: float = math.inf) -> list:
+        """
+        Find the bodies whose box is hit by a ray.
+
+        :param origin: origin of the ray
+        :type origin: tuple[float, float, float]
+        :param direction: direction of the ray, distances are measured in
+            multiples of its length
+        :type direction: tuple[float, float, float]
+        :param max_distance: length of the ray, defaults to math.inf
+        :type max_distance: float, optional
+        :return: pairs of distance and body sorted by distance
+        :rtype: list[tuple[float, Body]]
+        """
+
+        result = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node.body is not None:
+                low, high = _body_box(node.body)
+            else:
+                low, high = node.low, node.high
+
+            distance = ray_box(origin, direction, low, high, max_distance)
+
+            if distance is None:
+                continue
+
+            if node.body is not None:
+                result.append((distance, node.body))
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+
+        result.sort(key=lambda hit: hit[0])
+
+        return result
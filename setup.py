@@ -1,5 +1,6 @@
 from setuptools import setup, find_packages, Extension
 import pathlib
+import os
 
 here = pathlib.Path(__file__).parent.resolve()
 long_description = (here / "README.md").read_text(encoding="utf-8")
@@ -20,7 +21,8 @@ setup(
     keywords = "",
     package_dir = {"py3dgame": "py3dgame"},
     packages = find_packages(),
-    ext_modules = [Extension("ext_rendering", ["lib/ext_rendering.c"])],
+    ext_modules = [Extension("ext_rendering", ["lib/ext_rendering.c"],
+                             libraries = [] if os.name == "nt" else ["pthread"])],
     python_requires = ">= 3.10",
     install_requires = ["numpy", "pygame"],
     project_urls = {
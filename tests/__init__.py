@@ -0,0 +1,7 @@
+"""
+Tests for py3dgame, rendering runs on pygame's dummy video driver when no display is set.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -0,0 +1,111 @@
+"""
+Tests for the module assets
+"""
+
+import os
+import numpy as np
+import py3dgame as p3g
+from py3dgame.assets import load_mesh, load_obj, parse_obj
+
+
+OBJ = b"""# square and pentagon
+v 0 0 0
+v 1 0 0 1.0
+v 1 1 0
+v 0 1 0 # top left
+vt 0 0
+vn 0 0 1
+f 1/1/1 2/1/1 3/1/1 4/1/1\r
+v 2 0 0
+f -1 -4 -3# tri
+f 1 1 2
+f 1 2 9
+"""
+
+
+class TestAssets:
+    """
+    Class containing tests for the loading of meshes.
+    """
+
+    def test_parse_obj(self) -> None:
+        """
+        Test that :func:`parse_obj` triangulates the faces, resolves the negative
+        indexes and drops the degenerate and invalid faces.
+        """
+
+        vertices, faces = parse_obj(OBJ)
+
+        assert np.array_equal(vertices[1], (1, 0, 0))
+        assert vertices.shape == (5, 3) and vertices.dtype == np.float32
+        assert faces.tolist() == [[0, 1, 2], [0, 2, 3], [4, 1, 2]]
+        assert faces.dtype == np.int32
+
+        vertices, faces = parse_obj(b"")
+        assert vertices.shape == (0, 3) and faces.shape == (0, 3)
+
+    def test_cache(self, tmp_path) -> None:
+        """
+        Test that :func:`load_obj` writes the cache, reads it back and
+        ignores it after the .obj file changes.
+        """
+
+        obj_file = str(tmp_path / "mesh.obj")
+        with open(obj_file, "wb") as file:
+            file.write(OBJ)
+
+        vertices, faces = load_obj(obj_file)
+        assert os.path.exists(obj_file + ".npz")
+
+        cached_vertices, cached_faces = load_obj(obj_file)
+        assert np.array_equal(vertices, cached_vertices)
+        assert np.array_equal(faces, cached_faces)
+
+        with open(obj_file, "wb") as file:
+            file.write(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+
+        vertices, faces = load_obj(obj_file)
+        assert len(vertices) == 3 and faces.tolist() == [[0, 1, 2]]
+
+        for content in (b"not a cache", b""):
+            with open(obj_file + ".npz", "wb") as file:
+                file.write(content)
+
+            vertices, faces = load_obj(obj_file)
+            assert len(vertices) == 3 and faces.tolist() == [[0, 1, 2]]
+
+    def test_from_obj(self) -> None:
+        """
+        Test that :meth:`Body.from_obj` loads a mesh without the cache.
+        """
+
+        obj_file = os.path.join(os.path.dirname(__file__), "..", "assets", "coin.obj")
+        body = p3g.Body.from_obj(obj_file, cache=False)
+
+        assert body.name == obj_file
+        assert body.f_arr.shape == (1248, 3) and len(body.vertices_arr) == 626
+        assert len(body.n_arr) == len(body.c_arr) == len(body.f_arr)
+
+    def test_save_load(self, tmp_path) -> None:
+        """
+        Test that :meth:`Body.load` maps the mesh written by :meth:`Body.save`.
+        """
+
+        mesh_file = str(tmp_path / "sphere.p3m")
+        body = p3g.Body.sphere("sphere", 1, quality=1)
+        body.color = tuple((i, 255 - i, 0) for i in range(len(body.f_arr)))
+        body.save(mesh_file)
+
+        vertices, faces, colors = load_mesh(mesh_file)
+        assert isinstance(vertices, np.memmap) and vertices.dtype == np.float32
+        assert faces.dtype == np.int32 and colors.dtype == np.uint8
+
+        copy = p3g.Body.load(mesh_file, "copy", pos=p3g.Vec3(1, 0, 0))
+        assert np.array_equal(copy.vertices_arr, body.vertices_arr)
+        assert np.array_equal(copy.f_arr, body.f_arr)
+        assert np.array_equal(copy.c_arr, body.c_arr) and not copy.single_color
+        assert np.allclose(copy.v_arr, body.v_arr + (1, 0, 0))
+
+        p3g.Body.cube("cube", 1, color=(1, 2, 3)).save(mesh_file)
+        cube = p3g.Body.load(mesh_file)
+        assert cube.single_color and cube.color == (1, 2, 3)
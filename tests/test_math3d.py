@@ -3,7 +3,9 @@ Tests for the module math3d
 """
 
 import math
+import numpy as np
 import py3dgame as p3g
+from py3dgame.math3d import rotate, rotate_array
 
 
 class TestVec3:
@@ -191,6 +193,22 @@ class TestQuat:
         print(q1 * q2)
         assert (q1 * q2) == p3g.Quat.from_coord(- 18, 16, 16, 8)
 
+    def test_matrix(self) -> None:
+        """
+        Test matrix method of :class:`Quat`.
+        """
+
+        q = p3g.Quat(0.7, p3g.Vec3(1, - 2, 0.5))
+        v = p3g.Vec3(1, 2, 3)
+        expected = rotate(v, q)
+
+        assert q.matrix() is q.matrix()
+        assert np.allclose(q.matrix() @ (v.x, v.y, v.z), (expected.x, expected.y, expected.z))
+        assert abs((q.to_mat() @ v) - expected) < 1e-6
+
+        q.w, q.x, q.y, q.z = 0, 0, 0, 1
+        assert np.allclose(q.matrix(), ((-1, 0, 0), (0, -1, 0), (0, 0, 1)))
+
 
 class TestMat:
     """
@@ -227,3 +245,31 @@ class TestMat:
         m = p3g.Mat(p3g.Vec3(1, 0, 0), p3g.Vec3(0, 1, 0), p3g.Vec3(0, 0, 1))
 
         assert m @ p3g.Vec3(1, 2, 3) == p3g.Vec3(1, 2, 3)
+
+
+class TestRotate:
+    """
+    Class containing tests for the rotation functions.
+    """
+
+    def test_rotate(self) -> None:
+        """
+        Test :func:`rotate` with a quarter turn around the z axis.
+        """
+
+        v = rotate(p3g.Vec3(1, 0, 0), p3g.Quat(math.pi / 2, p3g.Vec3(0, 0, 1)))
+
+        assert v == p3g.Vec3(0, - 1, 0)
+
+    def test_rotate_array(self) -> None:
+        """
+        Test that :func:`rotate_array` matches :func:`rotate`.
+        """
+
+        quat = p3g.Quat(0.7, p3g.Vec3(1, - 2, 0.5))
+        vertices = np.array(((1, 0, 0), (0, 2, 0), (1, 2, 3), (- 4, 0.5, 1)))
+        rotated = rotate_array(vertices, quat)
+
+        for vertex, result in zip(vertices, rotated):
+            expected = rotate(p3g.Vec3(*vertex), quat)
+            assert np.allclose(result, (expected.x, expected.y, expected.z))
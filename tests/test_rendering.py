@@ -0,0 +1,674 @@
+"""
+Tests for the module rendering
+"""
+
+import numpy as np
+import pygame
+from ext_rendering import draw_triangle, draw_triangles, clear, resolve_depth, HIZ_TILE
+import py3dgame as p3g
+from py3dgame.rendering import depth_order
+
+
+def make_renderer(*bodies: p3g.Body) -> p3g.Renderer:
+    """
+    Create a renderer drawing on an off-screen surface.
+    """
+
+    scene = p3g.Scene(p3g.color.BLACK, light=p3g.Vec3(0, 1, -1).normalize())
+
+    for body in bodies:
+        scene.add_body(body)
+
+    camera = p3g.Camera(p3g.Vec3(-3, 0, 1), p3g.Vec3(1, 0, -0.3))
+    renderer = p3g.Renderer(pygame.Surface((160, 120)), camera, scene, pygame.time.Clock())
+    camera.update_projection_space(renderer.screen)
+    camera.update_view_space()
+
+    return renderer
+
+
+def make_buffers(w: int, h: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Create empty color and depth buffers.
+    """
+
+    return (np.zeros((w, h, 3), dtype=np.uint8),
+            np.full((w, h), 1000, dtype=np.float32))
+
+
+def buffer_args(buffer: np.ndarray, depth: np.ndarray) -> tuple:
+    """
+    Pointers and strides of the buffers as expected by ``ext_rendering``.
+    """
+
+    bs_x, bs_y, bs_c = buffer.strides
+    ds_x, ds_y = depth.strides
+
+    return (buffer.ctypes.data, bs_x, bs_y, bs_c, depth.ctypes.data, ds_x, ds_y)
+
+
+def covered(triangle: tuple, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Pixels whose center is inside a triangle with the top left rule,
+    given the centers in 1/16 of pixel.
+    """
+
+    points = [(round(p[0] * 16), round(p[1] * 16)) for p in triangle]
+    area = ((points[1][0] - points[0][0]) * (points[2][1] - points[0][1]) -
+            (points[1][1] - points[0][1]) * (points[2][0] - points[0][0]))
+    if area < 0:
+        points = points[::-1]
+
+    inside = np.ones(x.shape, dtype=bool)
+    for p, q in zip(points, points[1:] + points[:1]):
+        dx, dy = q[0] - p[0], q[1] - p[1]
+        edge = dx * (y - p[1]) - dy * (x - p[0])
+        top_left = dy < 0 or (dy == 0 and dx > 0)
+        inside &= (edge > 0) | (edge == 0) & top_left
+
+    return inside
+
+
+class TestExtRendering:
+    """
+    Class containing tests for the functions of ``ext_rendering``.
+    """
+
+    def test_draw_triangles(self) -> None:
+        """
+        Test that ``draw_triangles`` draws the same as one ``draw_triangle`` for each face.
+        """
+
+        rng = np.random.default_rng(0)
+        points = (rng.random((30, 3)) * (64, 48, 10)).astype(np.float32)
+        faces = rng.integers(0, 30, (40, 3)).astype(np.int32)
+        colors = rng.integers(0, 256, (40, 3)).astype(np.uint8)
+
+        buffer, depth = make_buffers(64, 48)
+        draw_triangles(*buffer_args(buffer, depth),
+                       points.ctypes.data, len(points),
+                       faces.ctypes.data, colors.ctypes.data, len(faces), 64, 48)
+
+        expected_buffer, expected_depth = make_buffers(64, 48)
+        for face, color in zip(faces, colors):
+            draw_triangle(*buffer_args(expected_buffer, expected_depth),
+                          *points[face].ravel().tolist(), *color.tolist(), 64, 48)
+
+        assert buffer.any()
+        assert np.array_equal(buffer, expected_buffer)
+        assert np.array_equal(depth, expected_depth)
+
+    def test_draw_triangle_coverage(self) -> None:
+        """
+        Test the pixels covered by ``draw_triangle`` against the edge functions
+        evaluated with NumPy at the pixel centers with the top left rule,
+        with the depth buffer stored by rows or by columns.
+        """
+
+        x, y = np.meshgrid(np.arange(64) * 16 + 8, np.arange(48) * 16 + 8, indexing="ij")
+        triangles = (((3.2, 2), (60, 20.5), (20.75, 45)),
+                     ((10, 10), (10, 40), (50, 10)),
+                     ((5.5, 5.5), (30.5, 5.5), (5.5, 30.5)))
+
+        for order in ("C", "F"):
+            for triangle in triangles:
+                buffer = np.zeros((64, 48, 3), dtype=np.uint8)
+                depth = np.full((64, 48), 1000, dtype=np.float32, order=order)
+                draw_triangle(*buffer_args(buffer, depth),
+                              *triangle[0], 1, *triangle[1], 2, *triangle[2], 3,
+                              255, 0, 0, 64, 48)
+
+                inside = covered(triangle, x, y)
+                assert inside.any()
+                assert np.array_equal(buffer[:, :, 0] == 255, inside)
+                assert np.array_equal(depth < 1000, inside)
+                assert 1 <= depth[inside].min() and depth[inside].max() <= 3
+
+    def test_draw_triangle_shared_edges(self) -> None:
+        """
+        Test that the triangles of a mesh covering the screen draw each pixel exactly once.
+        """
+
+        rng = np.random.default_rng(2)
+        x, y = np.meshgrid(np.linspace(-5, 69, 9), np.linspace(-5, 53, 9), indexing="ij")
+        grid = np.stack((x, y), axis=2) + rng.random((9, 9, 2)) * 4 - 2
+        grid[::2] = np.round(grid[::2] * 2) / 2
+        counts = np.zeros((64, 48), dtype=int)
+
+        for i in range(8):
+            for j in range(8):
+                quad = grid[i, j], grid[i + 1, j], grid[i + 1, j + 1], grid[i, j + 1]
+
+                for triangle in ((quad[0], quad[1], quad[2]), (quad[0], quad[3], quad[2])):
+                    buffer, depth = make_buffers(64, 48)
+                    draw_triangle(*buffer_args(buffer, depth),
+                                  *np.column_stack((triangle, np.ones(3))).ravel().tolist(),
+                                  255, 0, 0, 64, 48)
+                    counts += buffer[:, :, 0] == 255
+
+        assert (counts == 1).all()
+
+    def test_draw_triangle_guard_band(self) -> None:
+        """
+        Test that ``draw_triangle`` clips the triangles projected far off-screen
+        keeping their depth plane, and skips the ones with invalid coordinates.
+        """
+
+        x, y = np.meshgrid(np.arange(64), np.arange(48), indexing="ij")
+
+        for scale in (1e4, 1e6, 1e9):
+            buffer, depth = make_buffers(64, 48)
+            # depth plane z = 1 + (x + y) / 1000
+            draw_triangle(*buffer_args(buffer, depth),
+                          - scale, - scale, 1 - scale / 500,
+                          scale, - scale, 1,
+                          0, scale, 1 + scale / 1000,
+                          255, 0, 0, 64, 48)
+
+            assert (buffer[:, :, 0] == 255).all()
+            assert np.allclose(depth, 1 + (x + y + 1) / 1000, atol=1e-4)
+
+        buffer, depth = make_buffers(64, 48)
+        for point in ((float("nan"), 10, 1), (float("inf"), 10, 1), (10, 10, float("-inf"))):
+            draw_triangle(*buffer_args(buffer, depth),
+                          *point, 60, 5, 1, 5, 40, 1, 255, 0, 0, 64, 48)
+
+        assert not buffer.any()
+
+    def test_draw_triangles_threads(self) -> None:
+        """
+        Test that ``draw_triangles`` draws the same with more threads.
+        """
+
+        rng = np.random.default_rng(3)
+        points = (rng.random((500, 3)) * (300, 200, 10) - (20, 20, 0)).astype(np.float32)
+        faces = rng.integers(0, 500, (2000, 3)).astype(np.int32)
+        colors = rng.integers(0, 256, (2000, 3)).astype(np.uint8)
+        results = []
+
+        for threads in (1, 4):
+            buffer, depth = make_buffers(256, 160)
+            draw_triangles(*buffer_args(buffer, depth),
+                           points.ctypes.data, len(points),
+                           faces.ctypes.data, colors.ctypes.data, len(faces),
+                           256, 160, threads)
+            results.append((buffer, depth))
+
+        assert np.array_equal(results[0][0], results[1][0])
+        assert np.array_equal(results[0][1], results[1][1])
+
+    def test_draw_triangles_scissor(self) -> None:
+        """
+        Test that ``draw_triangles`` draws only inside the scissor rectangle,
+        the same pixels as without it, with one and more threads.
+        """
+
+        rng = np.random.default_rng(4)
+        points = (rng.random((500, 3)) * (300, 200, 10) - (20, 20, 0)).astype(np.float32)
+        faces = rng.integers(0, 500, (2000, 3)).astype(np.int32)
+        colors = rng.integers(0, 256, (2000, 3)).astype(np.uint8)
+
+        expected_buffer, expected_depth = make_buffers(256, 160)
+        draw_triangles(*buffer_args(expected_buffer, expected_depth),
+                       points.ctypes.data, len(points),
+                       faces.ctypes.data, colors.ctypes.data, len(faces), 256, 160)
+
+        for threads in (1, 4):
+            buffer, depth = make_buffers(256, 160)
+            draw_triangles(*buffer_args(buffer, depth),
+                           points.ctypes.data, len(points),
+                           faces.ctypes.data, colors.ctypes.data, len(faces),
+                           256, 160, threads, 0, 37, 21, 190, 133)
+
+            assert np.array_equal(buffer[37:190, 21:133], expected_buffer[37:190, 21:133])
+            assert np.array_equal(depth[37:190, 21:133], expected_depth[37:190, 21:133])
+            buffer[37:190, 21:133] = 0
+            depth[37:190, 21:133] = 1000
+            assert not buffer.any() and (depth == 1000).all()
+
+    def test_clear(self) -> None:
+        """
+        Test that ``clear`` fills only the rectangle, with the pixels stored
+        in both orders, and writes the depth of the lazily cleared tiles on demand.
+        """
+
+        rng = np.random.default_rng(4)
+        rows = rng.integers(0, 256, (150, 213, 4)).astype(np.uint8)
+        layouts = (rng.integers(0, 256, (210, 150, 3)).astype(np.uint8),
+                   rows[:, :210, 2::-1].transpose(1, 0, 2),
+                   rows[:, :210, :3].transpose(1, 0, 2))
+
+        for buffer in layouts:
+            depth = rng.random((210, 150)).astype(np.float32)
+            expected_buffer, expected_depth = buffer.copy(), depth.copy()
+            expected_buffer[5:101, 3:71] = (10, 20, 30)
+            expected_depth[5:101, 3:71] = 1000
+
+            clear(buffer.ctypes.data, *buffer.strides, 10, 20, 30,
+                  depth.ctypes.data, *depth.strides, 1000, 210, 150, 0, 5, 3, 101, 71)
+            assert np.array_equal(buffer, expected_buffer)
+            assert np.array_equal(depth, expected_depth)
+
+        buffer, depth = make_buffers(210, 150)
+        depth[:] = 5
+        hiz = np.full((-(-150 // HIZ_TILE), -(-210 // HIZ_TILE)), 5, dtype=np.float32)
+        args = buffer_args(buffer, depth)
+        clear(*args[:4], 0, 0, 0, *args[4:], 1000, 210, 150, hiz.ctypes.data, 5, 3, 210, 150)
+
+        assert np.isnan(hiz[1:, 1:]).all() and (hiz[0] == 1000).all() and (hiz[:, 0] == 1000).all()
+        assert (depth[8:, 8:] == 5).all()
+
+        resolve_depth(depth.ctypes.data, *depth.strides, 1000, 210, 150, hiz.ctypes.data)
+        assert (depth[5:, 3:] == 1000).all()
+        assert (depth[:5] == 5).all() and (depth[:, :3] == 5).all()
+        assert (hiz[1:, 1:] == 1000).all()
+
+    def test_draw_triangles_lazy_clear(self) -> None:
+        """
+        Test that ``draw_triangles`` after a lazy ``clear`` draws the same pixels
+        and depths as after clearing the whole depth buffer.
+        """
+
+        rng = np.random.default_rng(4)
+        points = (rng.random((300, 3)) * (250, 170, 10) - (20, 20, 0)).astype(np.float32)
+        faces = rng.integers(0, 300, (500, 3)).astype(np.int32)
+        colors = rng.integers(0, 256, (500, 3)).astype(np.uint8)
+        results = []
+
+        for hiz_value in (1000, np.nan):
+            buffer, depth = make_buffers(210, 150)
+            hiz = np.full((-(-150 // HIZ_TILE), -(-210 // HIZ_TILE)), hiz_value, dtype=np.float32)
+
+            if np.isnan(hiz_value):
+                depth[:] = -1
+
+            draw_triangles(*buffer_args(buffer, depth),
+                           points.ctypes.data, len(points),
+                           faces.ctypes.data, colors.ctypes.data, len(faces),
+                           210, 150, 1, hiz.ctypes.data, 0, 0, 210, 150, 1000)
+            resolve_depth(depth.ctypes.data, *depth.strides, 1000, 210, 150, hiz.ctypes.data)
+            results.append((buffer, depth))
+
+        assert np.array_equal(results[0][0], results[1][0])
+        assert np.array_equal(results[0][1], results[1][1])
+
+    def test_draw_triangles_hiz(self) -> None:
+        """
+        Test that the coarse depth buffer of ``draw_triangles`` skips work
+        without changing what is drawn.
+        """
+
+        rng = np.random.default_rng(4)
+        points = (rng.random((600, 3)) * (250, 170, 10) - (20, 20, 0)).astype(np.float32)
+        faces = rng.integers(0, 600, (3000, 3)).astype(np.int32)
+        colors = rng.integers(0, 256, (3000, 3)).astype(np.uint8)
+        results = []
+
+        for threads, use_hiz in ((1, False), (1, True), (4, True)):
+            buffer, depth = make_buffers(210, 150)
+            hiz = np.full((-(-150 // HIZ_TILE), -(-210 // HIZ_TILE)), 1000, dtype=np.float32)
+            draw_triangles(*buffer_args(buffer, depth),
+                           points.ctypes.data, len(points),
+                           faces.ctypes.data, colors.ctypes.data, len(faces),
+                           210, 150, threads, hiz.ctypes.data if use_hiz else 0)
+            results.append((buffer, depth))
+
+            if use_hiz:
+                padded = np.pad(depth.T, ((0, 2), (0, 6)))
+                tiles = padded.reshape((19, 8, 27, 8)).max(axis=(1, 3))
+                assert (hiz >= tiles).all()
+                assert (hiz < 1000).any()
+
+        for buffer, depth in results[1:]:
+            assert np.array_equal(results[0][0], buffer)
+            assert np.array_equal(results[0][1], depth)
+
+
+class TestCamera:
+    """
+    Class containing tests for the methods of :class:`Camera`.
+    """
+
+    def test_is_visible(self) -> None:
+        """
+        Test is_visible method of :class:`Camera`.
+        """
+
+        renderer = make_renderer()
+        camera = renderer.camera
+
+        assert camera.is_visible(p3g.Body.cube("front", 1, pos=p3g.Vec3(2, 0, 0)))
+        assert not camera.is_visible(p3g.Body.cube("behind", 1, pos=p3g.Vec3(-6, 0, 1)))
+        assert not camera.is_visible(p3g.Body.cube("right", 1, pos=p3g.Vec3(0, -20, 0)))
+        assert not camera.is_visible(p3g.Body.cube("far", 1, pos=p3g.Vec3(2000, 0, -600)))
+
+    def test_is_visible_conservative(self) -> None:
+        """
+        Test that the bodies rejected by is_visible of :class:`Camera` have no visible faces.
+        """
+
+        rng = np.random.default_rng(1)
+        renderer = make_renderer()
+        renderer.map_buffer()
+
+        for i in range(200):
+            pos = p3g.Vec3(*(rng.random(3) * 30 - 15).tolist())
+            body = p3g.Body.cube(str(i), 2, pos=pos, rot=p3g.Quat(rng.random() * 6))
+
+            if not renderer.camera.is_visible(body):
+                renderer.render_body(body)
+
+        renderer.unmap_buffer()
+        assert renderer.triangles == 0
+
+
+class TestRenderer:
+    """
+    Class containing tests for the methods of :class:`Renderer`.
+    """
+
+    def test_project_vertices(self) -> None:
+        """
+        Test that :meth:`Renderer.project_vertices` matches the per point projection.
+        """
+
+        body = p3g.Body.sphere("sphere", 1, quality=1)
+        renderer = make_renderer(body)
+
+        points = renderer.project_vertices(body.v_arr)
+        expected = [renderer.project_point(renderer.to_view_space(v)) for v in body.v]
+
+        assert np.allclose(points, expected, rtol=1e-4, atol=1e-3)
+
+    def test_project_body(self) -> None:
+        """
+        Test that :meth:`Renderer.project_body` keeps a buffer for each body
+        and reuses it until the body or the camera move.
+        """
+
+        body1 = p3g.Body.cube("cube1", 1)
+        body2 = p3g.Body.cube("cube2", 1, pos=p3g.Vec3(0, 1.5, 0))
+        renderer = make_renderer(body1, body2)
+
+        points1 = renderer.project_body(body1)
+        points2 = renderer.project_body(body2)
+
+        assert np.allclose(points1, renderer.project_vertices(body1.v_arr))
+        assert np.allclose(points2, renderer.project_vertices(body2.v_arr))
+        assert not np.allclose(points1, points2)
+
+        stamp = body2.proj_stamp
+        body1.traslate(p3g.Vec3(0, 0, 1))
+        assert renderer.project_body(body1) is points1
+        assert np.allclose(points1, renderer.project_vertices(body1.v_arr))
+        renderer.project_body(body2)
+        assert body2.proj_stamp is stamp
+
+        renderer.camera.pos = p3g.Vec3(-4, 0, 1)
+        renderer.camera.update_view_space()
+        assert np.allclose(renderer.project_body(body2), renderer.project_vertices(body2.v_arr))
+
+    def test_clip_near(self) -> None:
+        """
+        Test that :meth:`Renderer.clip_near` cuts the faces on the near plane
+        and that a floor passing under the camera is drawn.
+        """
+
+        vertices = np.array(((-20, -20, -0.5), (20, -20, -0.5),
+                             (20, 20, -0.5), (-20, 20, -0.5)), dtype=np.float32)
+        floor = p3g.Body("floor", vertices, ((0, 1, 2), (0, 2, 3)))
+        renderer = make_renderer(floor)
+
+        points = renderer.project_body(floor)
+        behind = (points[floor.f_arr, 2] < renderer.camera.znear).sum(axis=1)
+        assert sorted(behind.tolist()) == [1, 2]
+
+        new, clipped, source = renderer.clip_near(floor.v_arr[floor.f_arr], points, floor.f_arr)
+        triangles = np.concatenate((points, new))[clipped]
+
+        assert sorted(source.tolist()) == ([0, 0, 1] if behind[0] == 1 else [0, 1, 1])
+        assert np.allclose(new[:, 2], renderer.camera.znear, atol=1e-4)
+        assert (triangles[:, :, 2] > renderer.camera.znear - 1e-4).all()
+
+        # the faces of a flat quad keep the same winding after clipping
+        edges = triangles[:, 1:, :2] - triangles[:, :1, :2]
+        areas = edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]
+        assert (areas > 0).all() or (areas < 0).all()
+
+        pygame.display.set_mode((160, 120))
+        renderer.render()
+
+        assert renderer.triangles == 3
+        assert pygame.surfarray.array3d(renderer.screen)[:, 60:].any(axis=2).all()
+
+        # an instance of the floor is clipped the same way
+        image = pygame.surfarray.array3d(renderer.screen)
+        renderer.scene.remove_body("floor")
+        renderer.scene.add_body(p3g.Instance("floor", floor))
+        renderer.render()
+
+        assert renderer.triangles == 3
+        assert np.array_equal(pygame.surfarray.array3d(renderer.screen), image)
+
+    def test_render_lod(self) -> None:
+        """
+        Test that :meth:`Renderer.render` draws the level of detail matching
+        the size of the body on the screen.
+        """
+
+        pygame.display.set_mode((160, 120))
+        body = p3g.Body.sphere("sphere", 1, quality=3)
+        coarse = p3g.Body.sphere("coarse", 1, quality=0)
+        body.add_lod(coarse.vertices_arr, coarse.f_arr, 40)
+        renderer = make_renderer(body)
+
+        assert renderer.camera.screen_size(body) > 40
+        renderer.render()
+        assert body.lod == 0
+
+        body.move(pos=p3g.Vec3(30, 0, -8))
+        assert renderer.camera.screen_size(body) < 30
+        renderer.render()
+        assert body.lod == 1
+        assert 0 < renderer.triangles <= len(coarse.f_arr)
+
+    def test_render(self) -> None:
+        """
+        Test that :meth:`Renderer.render` draws the same on screens with and without
+        direct access to their pixels.
+        """
+
+        pygame.display.set_mode((160, 120))
+        screens = []
+
+        for depth in (32, 16):
+            renderer = make_renderer(p3g.Body.sphere("sphere", 1, quality=2))
+            renderer.screen = pygame.Surface((160, 120), depth=depth)
+            renderer.resize()
+            renderer.render()
+
+            assert renderer.direct == (depth == 32)
+            assert renderer.buffer is None or not renderer.direct
+            screens.append(pygame.surfarray.array3d(renderer.screen)[:, 60:])
+
+        assert screens[0].any()
+        assert np.abs(screens[0].astype(int) - screens[1]).max() <= 8
+
+    def test_render_body_outside_render(self) -> None:
+        """
+        Test that :meth:`Renderer.render_body` and :meth:`Renderer.render_instance`
+        can be called outside :meth:`Renderer.render`.
+        """
+
+        sphere = p3g.Body.sphere("sphere", 1, quality=2)
+
+        for depth in (32, 16):
+            for body in (sphere, p3g.Instance("copy", sphere)):
+                renderer = make_renderer()
+                renderer.screen = pygame.Surface((160, 120), depth=depth)
+                renderer.resize()
+
+                if isinstance(body, p3g.Instance):
+                    renderer.render_instance(body)
+                else:
+                    renderer.render_body(body)
+
+                assert pygame.surfarray.array3d(renderer.screen).any()
+                assert renderer.buffer is None or not renderer.direct
+
+    def test_render_sorted(self) -> None:
+        """
+        Test that drawing front to back gives the same image.
+        """
+
+        pygame.display.set_mode((160, 120))
+        screens = []
+        depths = []
+
+        for sort in (False, True):
+            renderer = make_renderer(p3g.Body.cube("far", 1, pos=p3g.Vec3(2, 0, 0)),
+                                     p3g.Body.sphere("near", 0.5, quality=2))
+            renderer.options.sort = sort
+            renderer.render()
+            screens.append(pygame.surfarray.array3d(renderer.screen)[:, 60:])
+            depths.append(renderer.get_depth().copy())
+
+        assert np.array_equal(screens[0], screens[1])
+        assert np.allclose(depths[0], depths[1])
+
+    def test_depth_order(self) -> None:
+        """
+        Test that :func:`depth_order` sorts from near to far keeping ties in order.
+        """
+
+        depth = np.array((5, 1, 3, 1, 1000, 0.5), dtype=np.float32)
+
+        assert depth_order(depth).tolist() == [5, 1, 3, 2, 0, 4]
+        assert depth_order(np.ones(3)).tolist() == [0, 1, 2]
+        assert len(depth_order(np.empty(0))) == 0
+
+    def test_render_instance(self) -> None:
+        """
+        Test that an :class:`Instance` is drawn like a :class:`Body` with its own mesh.
+        """
+
+        pygame.display.set_mode((160, 120))
+        colors = (p3g.color.RED, p3g.color.GREEN, p3g.color.BLUE,
+                  p3g.color.PURPLE, p3g.color.YELLOW, p3g.color.CYAN)
+        pos, rot = p3g.Vec3(0.5, 0.2, 0), p3g.Quat(0.7, p3g.Vec3(1, 1, 1))
+        mesh = p3g.Body.cube("mesh", 1, color=colors)
+        screens = []
+        depths = []
+
+        for body in (p3g.Body.cube("body", 1, pos=pos, rot=rot, color=colors),
+                     p3g.Instance("instance", mesh, pos, rot)):
+            renderer = make_renderer(body)
+            renderer.render()
+            screens.append(pygame.surfarray.array3d(renderer.screen)[:, 60:])
+            depths.append(renderer.get_depth().copy())
+
+        assert screens[0].any()
+        assert (np.abs(screens[0].astype(int) - screens[1]).sum(axis=2) > 0).mean() < 0.01
+        assert np.allclose(depths[0], depths[1], atol=1e-3)
+
+        renderer = make_renderer(p3g.Instance("red", mesh, pos, rot, color=p3g.color.RED))
+        renderer.render()
+        screen = pygame.surfarray.array3d(renderer.screen)[:, 60:]
+        assert screen[..., 0].any() and not screen[..., 1:].any()
+
+    def test_render_static(self) -> None:
+        """
+        Test that the static bodies drawn in batches look the same.
+        """
+
+        pygame.display.set_mode((160, 120))
+        screens = []
+
+        for static in (False, True):
+            renderer = make_renderer()
+
+            for i in range(4):
+                renderer.scene.add_body(p3g.Body.cube(f"cube{i}", 0.5, pos=p3g.Vec3(i, i - 1.5, 0)),
+                                        static)
+
+            renderer.render()
+            screens.append(pygame.surfarray.array3d(renderer.screen)[:, 60:])
+
+        assert screens[0].any()
+        assert (np.abs(screens[0].astype(int) - screens[1]).sum(axis=2) > 0).mean() < 0.01
+
+    def test_render_reuse(self) -> None:
+        """
+        Test that :meth:`Renderer.render` with ``reuse`` keeps the image while nothing changes.
+        """
+
+        pygame.display.set_mode((160, 120))
+
+        for depth in (32, 16):
+            body = p3g.Body.sphere("sphere", 1, quality=2)
+            renderer = make_renderer(body)
+            renderer.options.reuse = True
+            renderer.screen = pygame.Surface((160, 120), depth=depth)
+            renderer.resize()
+            renderer.render()
+            screen = pygame.surfarray.array3d(renderer.screen)
+
+            renderer.get_depth()[0, 0] = 5
+            renderer.render()
+            assert renderer.get_depth()[0, 0] == 5
+            assert np.array_equal(pygame.surfarray.array3d(renderer.screen), screen)
+
+            body.rotate_deg(10)
+            renderer.render()
+            assert renderer.get_depth()[0, 0] == renderer.camera.zfar
+
+            renderer.get_depth()[0, 0] = 5
+            renderer.camera.pos = p3g.Vec3(-3, 0, 1.1)
+            renderer.render()
+            assert renderer.get_depth()[0, 0] == renderer.camera.zfar
+
+            renderer.get_depth()[0, 0] = 5
+            renderer.invalidate()
+            renderer.render()
+            assert renderer.get_depth()[0, 0] == renderer.camera.zfar
+
+            # without reuse every frame is drawn
+            renderer.get_depth()[0, 0] = 5
+            renderer.options.reuse = False
+            renderer.render()
+            assert renderer.get_depth()[0, 0] == renderer.camera.zfar
+
+    def test_render_dirty(self) -> None:
+        """
+        Test that drawing only the regions of the bodies that changed gives
+        the same image as drawing the whole scene.
+        """
+
+        pygame.display.set_mode((160, 120))
+        renderers = []
+
+        for dirty_rects in (False, True):
+            renderer = make_renderer(p3g.Body.cube("cube", 1, pos=p3g.Vec3(1, 0.5, 0)),
+                                     p3g.Body.sphere("sphere", 0.3, quality=2,
+                                                     pos=p3g.Vec3(0, -1, 0)))
+            renderer.options.dirty_rects = dirty_rects
+            renderers.append(renderer)
+
+        for step in range(4):
+            for renderer in renderers:
+                renderer.scene.bodies["sphere"].traslate(p3g.Vec3(0, 0.2, 0))
+
+                if step == 2:
+                    renderer.scene.remove_body("cube")
+
+                renderer.render()
+
+            screens = [pygame.surfarray.array3d(renderer.screen)[:, 60:] for renderer in renderers]
+            assert np.array_equal(screens[0], screens[1])
+            assert np.array_equal(renderers[0].get_depth(), renderers[1].get_depth())
+
+        # the pixels away from the sphere are not drawn again
+        renderers[1].get_depth()[-1, -1] = 5
+        renderers[1].scene.bodies["sphere"].traslate(p3g.Vec3(0, 0.2, 0))
+        renderers[1].render()
+        assert renderers[1].get_depth()[-1, -1] == 5
@@ -0,0 +1,224 @@
+"""
+Tests for the module scene
+"""
+
+import math
+import numpy as np
+import py3dgame as p3g
+
+
+class TestBody:
+    """
+    Class containing tests for the methods of :class:`Body`.
+    """
+
+    def test_lazy_move(self) -> None:
+        """
+        Test that moving a :class:`Body` only marks it as dirty
+        and the world coordinates are computed when read.
+        """
+
+        body = p3g.Body.cube("cube", 1)
+        body.rotate_deg(30)
+        body.traslate(p3g.Vec3(1, 2, 3))
+
+        assert body.dirty
+
+        expected = p3g.Body.cube("expected", 1, pos=p3g.Vec3(1, 2, 3),
+                                 rot=p3g.Quat(math.pi / 6, p3g.Vec3(0, 0, 1)))
+
+        assert np.allclose(body.v_arr, expected.v_arr, atol=1e-6)
+        assert np.allclose(body.n_arr, expected.n_arr, atol=1e-6)
+        assert not body.dirty
+
+    def test_relative_move(self) -> None:
+        """
+        Test relative_move method of :class:`Body`.
+        """
+
+        body = p3g.Body.cube("cube", 1, pos=p3g.Vec3(1, 0, 0))
+        body.relative_move(pos=p3g.Vec3(0, 0, 1), rot=p3g.Quat(math.pi, p3g.Vec3(0, 0, 1)))
+
+        assert np.allclose(body.v_arr.mean(axis=0), (-1, 0, 1), atol=1e-6)
+        body.compute_normals()
+        assert np.allclose(body.n_arr, body.normals_arr @ p3g.Quat(math.pi).matrix().T,
+                           atol=1e-6)
+
+        # the movement is kept when the world coordinates are computed again
+        body.relative_move(pos=p3g.Vec3(1, 0, 0), rot=p3g.Quat(math.pi / 2, p3g.Vec3(1, 0, 0)),
+                           first_rotate=False)
+        moved = body.v_arr.copy()
+        body.add_lod(body.vertices_arr, body.f_arr, 10)
+        body.set_lod(1)
+        assert np.allclose(body.v_arr, moved, atol=1e-5)
+        assert np.allclose(body.v_arr.mean(axis=0), (0, 1, 0), atol=1e-5)
+        assert np.allclose(body.aabb_min + body.aabb_max, (0, 2, 0), atol=1e-5)
+
+    def test_lod(self) -> None:
+        """
+        Test that :class:`Body` switches its levels of detail with hysteresis.
+        """
+
+        body = p3g.Body.sphere("sphere", 1, quality=3, pos=p3g.Vec3(0, 0, 2))
+        full = len(body.f_arr)
+        coarse = p3g.Body.sphere("coarse", 1, quality=0)
+        middle = p3g.Body.sphere("middle", 1, quality=1)
+
+        body.add_lod(coarse.vertices_arr, coarse.f_arr, 20)
+        body.add_lod(middle.vertices_arr, middle.f_arr, 100)
+
+        assert [level[0] for level in body.lods] == [math.inf, 100, 20]
+        assert body.select_lod(500) == 0 and len(body.f_arr) == full
+        assert body.select_lod(90) == 0
+        assert body.select_lod(50) == 1 and len(body.f_arr) == len(middle.f_arr)
+        assert body.select_lod(110) == 1
+        assert body.select_lod(10) == 2
+        assert body.select_lod(22) == 2
+        assert body.select_lod(500) == 0
+
+        body.select_lod(10)
+        assert np.allclose(body.v_arr, coarse.vertices_arr + (0, 0, 2), atol=1e-6)
+        assert len(body.n_arr) == len(body.f_arr) == len(body.c_arr)
+        assert len(body.proj) == len(body.vertices_arr)
+
+        body.color = p3g.color.RED
+        assert all((level[4] == p3g.color.RED).all() for level in body.lods)
+        body.select_lod(500)
+        assert (body.c_arr == p3g.color.RED).all()
+
+
+class TestInstance:
+    """
+    Class containing tests for :class:`Instance`.
+    """
+
+    def test_move(self) -> None:
+        """
+        Test that an :class:`Instance` shares the mesh and is placed like a :class:`Body`.
+        """
+
+        mesh = p3g.Body.sphere("mesh", 1, quality=1)
+        pos, rot = p3g.Vec3(1, 2, 3), p3g.Quat(0.5, p3g.Vec3(0, 1, 1))
+
+        for first_rotate in (True, False):
+            instance = p3g.Instance("instance", mesh)
+            instance.move(pos, rot, first_rotate)
+            body = p3g.Body.sphere("body", 1, quality=1)
+            body.move(pos, rot, first_rotate)
+
+            assert instance.f_arr is mesh.f_arr and instance.vertices_arr is mesh.vertices_arr
+            assert np.allclose(instance.v_arr, body.v_arr, atol=1e-5)
+            assert np.allclose(instance.n_arr, body.n_arr, atol=1e-5)
+            assert np.allclose(instance.aabb_min, body.aabb_min, atol=1e-5)
+            assert np.allclose(instance.center, body.center, atol=1e-5)
+
+    def test_lod(self) -> None:
+        """
+        Test that each :class:`Instance` selects its own level of detail of the mesh.
+        """
+
+        mesh = p3g.Body.sphere("mesh", 1, quality=2)
+        mesh.generate_lods((50,))
+        near = p3g.Instance("near", mesh)
+        far = p3g.Instance("far", mesh)
+
+        assert far.select_lod(10) == 1 and len(far.f_arr) == len(mesh.lods[1][3])
+        assert near.select_lod(100) == 0 and near.f_arr is mesh.f_arr
+        assert mesh.lod == 0
+
+
+class TestScene:
+    """
+    Class containing tests for the methods of :class:`Scene`.
+    """
+
+    def test_static_batches(self, monkeypatch) -> None:
+        """
+        Test that the static bodies are merged in batches built again only
+        after the static bodies change.
+        """
+
+        scene = p3g.Scene()
+        colors = (p3g.color.RED, p3g.color.GREEN, p3g.color.BLUE)
+
+        for i in range(6):
+            scene.add_body(p3g.Body.cube(f"cube{i}", 1, pos=p3g.Vec3(2 * i, 0, 0),
+                                         color=colors[i % 3]), static=i > 0)
+
+        batches = scene.static_batches()
+        assert len(batches) == 1 and scene.static_batches() is batches
+        assert len(batches[0].f_arr) == 5 * 12
+        assert np.allclose(batches[0].aabb_min, (1.5, -0.5, -0.5))
+        assert np.allclose(batches[0].aabb_max, (10.5, 0.5, 0.5))
+        assert np.array_equal(batches[0].c_arr[:12], scene.bodies["cube1"].c_arr)
+
+        scene.remove_body("cube5")
+        assert len(scene.static_batches()[0].f_arr) == 4 * 12
+
+        # moved static bodies report the change to their scene
+        scene.bodies["cube1"].traslate(p3g.Vec3(0, 0, 1))
+        batches = scene.static_batches()
+        assert np.allclose(batches[0].aabb_max, (8.5, 0.5, 1.5))
+        assert scene.static_batches() is batches
+
+        scene.add_body(p3g.Instance("red", scene.bodies["cube0"], color=p3g.color.RED),
+                       static=True)
+        assert (scene.static_batches()[0].c_arr[-12:] == p3g.color.RED).all()
+        scene.remove_body("red")
+
+        monkeypatch.setattr(p3g.scene, "BATCH_FACES", 24)
+        scene.set_static("cube0")
+        batches = scene.static_batches()
+        assert [len(batch.f_arr) for batch in batches] == [24, 12, 24]
+        assert batches[0].aabb_max[0] < batches[-1].aabb_min[0]
+
+    def test_static_query(self) -> None:
+        """
+        Test that the static bodies are left out of the frustum query only
+        when asked and are found by the other queries, with and without index.
+        """
+
+        planes = np.array([[1, 0, 0, 1]])
+
+        for spatial_index in (False, True):
+            scene = p3g.Scene(spatial_index=spatial_index)
+
+            for i in range(4):
+                scene.add_body(p3g.Body.cube(f"cube{i}", 1, pos=p3g.Vec3(2 * i, 0, 0)),
+                               static=i % 2 == 1)
+
+            names = {body.name for body in scene.query_frustum(planes, static=False)}
+            assert names == {"cube0", "cube2"}
+            assert len(scene.query_frustum(planes)) == 4
+            assert [body.name for _, body in scene.query_ray(
+                p3g.Vec3(-5, 0, 0), p3g.Vec3(1, 0, 0))] == [f"cube{i}" for i in range(4)]
+
+            scene.set_static("cube1", False)
+            scene.remove_body("cube3")
+            assert scene.bodies["cube1"].static_scene is None
+            names = {body.name for body in scene.query_frustum(planes, static=False)}
+            assert names == {"cube0", "cube1", "cube2"}
+            assert len(scene.query_radius(p3g.Vec3(0, 0, 0), 100)) == 3
+
+    def test_version(self) -> None:
+        """
+        Test that the versions of the scene and of its bodies change with them.
+        """
+
+        scene = p3g.Scene()
+        cube = p3g.Body.cube("cube", 1)
+        scene.add_body(cube)
+        versions = [scene.version]
+
+        scene.set_static("cube")
+        versions.append(scene.version)
+        scene.remove_body("cube")
+        versions.append(scene.version)
+        assert versions == sorted(set(versions))
+
+        version = cube.version
+        cube.traslate(p3g.Vec3(1, 0, 0))
+        assert cube.version > version
+        version = cube.version
+        cube.color = p3g.color.RED
+        assert cube.version > version
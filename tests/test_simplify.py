@@ -0,0 +1,108 @@
+"""
+Tests for the module simplify
+"""
+
+import numpy as np
+import py3dgame as p3g
+from py3dgame.simplify import simplify, weld
+
+
+def grid(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flat square of n x n quads split in triangles.
+    """
+
+    x, y = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    vertices = np.column_stack((x.ravel(), y.ravel(), np.zeros(x.size))).astype(np.float32)
+    index = np.arange((n + 1) * (n + 1)).reshape(n + 1, n + 1)
+    a, b = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    c, d = index[1:, 1:].ravel(), index[:-1, 1:].ravel()
+    faces = np.concatenate((np.column_stack((a, b, c)), np.column_stack((a, c, d))))
+
+    return vertices, faces
+
+
+class TestSimplify:
+    """
+    Class containing tests for the mesh simplification.
+    """
+
+    def test_weld(self) -> None:
+        """
+        Test that :func:`weld` merges the duplicated vertices.
+        """
+
+        vertices = np.array(((0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 0, 0), (1, 1, 0)))
+        vertices, faces, kept = weld(vertices, np.array(((0, 1, 2), (3, 4, 2), (1, 3, 4))))
+
+        assert len(vertices) == 4
+        assert kept.tolist() == [0, 1]
+        assert faces[0, 1] == faces[1, 0]
+
+    def test_sphere(self) -> None:
+        """
+        Test that a simplified sphere keeps its shape and stays closed.
+        """
+
+        sphere = p3g.Body.sphere("sphere", 1, quality=3)
+        vertices, faces, source = simplify(sphere.vertices_arr, sphere.f_arr, 200)
+
+        assert len(faces) <= 200 and len(source) == len(faces)
+        assert np.abs(np.linalg.norm(vertices, axis=1) - 1).max() < 0.05
+
+        edges = np.sort(np.concatenate((faces[:, :2], faces[:, 1:], faces[:, ::2])), axis=1)
+        _, counts = np.unique(edges, axis=0, return_counts=True)
+        assert (counts == 2).all()
+
+        # the faces keep the orientation of the original ones
+        outward = np.sign(sphere.normals_arr[0] @ sphere.vertices_arr[sphere.f_arr[0, 0]])
+        normals = p3g.body.face_normals(vertices, faces)
+        assert (np.einsum("ij,ij->i", normals, vertices[faces[:, 0]]) * outward > 0).all()
+
+    def test_max_error_scale(self) -> None:
+        """
+        Test that ``max_error`` is a distance, so scaling the mesh and the error
+        together gives the same simplified mesh.
+        """
+
+        sphere = p3g.Body.sphere("sphere", 1, quality=3)
+        results = [simplify(sphere.vertices_arr * scale, sphere.f_arr, max_error=0.05 * scale)
+                   for scale in (1, 64)]
+
+        assert len(results[0][1]) < len(sphere.f_arr) / 10
+        assert np.array_equal(results[0][1], results[1][1])
+        assert np.allclose(results[0][0] * 64, results[1][0])
+
+    def test_flat(self) -> None:
+        """
+        Test that a flat mesh is reduced without leaving its plane and outline.
+        """
+
+        vertices, faces = grid(8)
+        simple_vertices, simple_faces, _ = simplify(vertices, faces, max_error=1e-3)
+
+        assert len(simple_faces) < len(faces) / 4
+        assert np.allclose(simple_vertices[:, 2], 0)
+        assert np.allclose(simple_vertices[:, :2].min(axis=0), 0)
+        assert np.allclose(simple_vertices[:, :2].max(axis=0), 8)
+
+        p1, p2, p3 = simple_vertices[simple_faces].transpose(1, 0, 2)
+        assert np.isclose(np.abs(np.cross(p2 - p1, p3 - p1)[:, 2]).sum() / 2, 64)
+
+    def test_body_lods(self) -> None:
+        """
+        Test the simplified copy and the generated levels of detail of a :class:`Body`.
+        """
+
+        colors = tuple((i % 256, 0, 0) for i in range(320))
+        body = p3g.Body.sphere("sphere", 1, quality=2, pos=p3g.Vec3(1, 2, 3))
+        body.color = colors
+
+        copy = body.simplified(0.25, name="copy")
+        assert copy.name == "copy" and len(copy.f_arr) <= 80
+        assert np.allclose(copy.center, body.center, atol=0.1)
+        assert set(map(tuple, copy.c_arr.tolist())) <= set(colors)
+
+        body.generate_lods((100, 30))
+        assert [len(level[3]) for level in body.lods] == [320, 160, 80]
+        assert body.select_lod(10) == 2 and len(body.c_arr) == 80
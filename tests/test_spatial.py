@@ -0,0 +1,108 @@
+"""
+Tests for the module spatial
+"""
+
+import numpy as np
+import py3dgame as p3g
+from py3dgame.spatial import BVH, sphere_box, ray_box
+
+
+def make_scene(spatial_index: bool) -> p3g.Scene:
+    """
+    Create a scene with many scattered cubes.
+    """
+
+    rng = np.random.default_rng(2)
+    scene = p3g.Scene(spatial_index=spatial_index)
+
+    for i in range(150):
+        pos = p3g.Vec3(*(rng.random(3) * 100 - 50).tolist())
+        scene.add_body(p3g.Body.cube(str(i), rng.random() * 3 + 0.1, pos=pos))
+
+    return scene
+
+
+def names(bodies: list) -> set[str]:
+    """
+    Names of a list of bodies.
+    """
+
+    return {body.name for body in bodies}
+
+
+class TestBVH:
+    """
+    Class containing tests for the methods of :class:`BVH`.
+    """
+
+    def test_insert_remove(self) -> None:
+        """
+        Test insert and remove methods of :class:`BVH`.
+        """
+
+        bvh = BVH()
+        bodies = [p3g.Body.cube(str(i), 1, pos=p3g.Vec3(i, 0, 0)) for i in range(10)]
+
+        for body in bodies:
+            bvh.insert(body)
+
+        for body in bodies[::2]:
+            bvh.remove(body)
+
+        assert len(bvh) == 5
+        assert bodies[1] in bvh
+        assert bodies[0] not in bvh
+        assert names(bvh.query_radius((0, 0, 0), 100)) == {"1", "3", "5", "7", "9"}
+
+    def test_queries(self) -> None:
+        """
+        Test that the queries of a scene with an index match the ones without index.
+        """
+
+        indexed = make_scene(True)
+        linear = make_scene(False)
+
+        for scene in (indexed, linear):
+            for i in range(0, 150, 3):
+                scene.bodies[str(i)].traslate(p3g.Vec3(20, -5, 3))
+
+        planes = np.array(((1, 0, 0, 10), (-1, 0, 0, 10), (0, 1, 0, 30), (0, 0, -1, 0)))
+        center = p3g.Vec3(5, 5, 5)
+        origin = p3g.Vec3(-60, 0, 0)
+        direction = p3g.Vec3(1, 0.1, 0.05)
+
+        assert len(indexed.index) == 150
+        assert (names(indexed.query_radius(center, 20)) ==
+                names(linear.query_radius(center, 20)))
+        assert names(indexed.query_frustum(planes)) == {
+            body.name for body in linear.bodies.values()
+            if all((np.abs(plane[:3]) @ (body.aabb_max - body.aabb_min) / 2 +
+                    plane[:3] @ body.center + plane[3]) >= 0 for plane in planes)}
+        assert ([body.name for _, body in indexed.query_ray(origin, direction)] ==
+                [body.name for _, body in linear.query_ray(origin, direction)])
+
+        indexed.remove_body("1")
+        assert "1" not in names(indexed.query_radius(p3g.Vec3(0, 0, 0), 1000))
+
+
+class TestFunctions:
+    """
+    Class containing tests for the intersection functions.
+    """
+
+    def test_sphere_box(self) -> None:
+        """
+        Test :func:`sphere_box`.
+        """
+
+        assert sphere_box((0, 0, 0), 1, (0.5, -1, -1), (2, 1, 1))
+        assert not sphere_box((0, 0, 0), 1, (0.8, 0.8, 0.8), (2, 2, 2))
+
+    def test_ray_box(self) -> None:
+        """
+        Test :func:`ray_box`.
+        """
+
+        assert ray_box((0, 0, 0), (1, 0, 0), (2, -1, -1), (3, 1, 1)) == 2
+        assert ray_box((0, 0, 0), (-1, 0, 0), (2, -1, -1), (3, 1, 1)) is None
+        assert ray_box((0, 0, 0), (1, 0, 0), (2, -1, -1), (3, 1, 1), 1) is None